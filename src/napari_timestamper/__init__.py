@@ -3,18 +3,23 @@ try:
 except ImportError:
     __version__ = "unknown"
 
-from ._layer_annotator_overlay import (
-    LayerAnnotatorOverlay,
-    VispyLayerAnnotatorOverlay,
-)
-from ._timestamp_overlay import TimestampOverlay, VispyTimestampOverlay
-from ._widget import (
-    LayerAnnotationsWidget,
-    LayertoRGBWidget,
-    RenderRGBWidget,
-    TimestampWidget,
-)
-from .render_as_rgb import render_as_rgb, save_image_stack
+import importlib
+
+# the exports are imported on first access, so that napari's plugin
+# discovery does not pay for importing vispy, the overlays and the widgets
+_LAZY_EXPORTS = {
+    "LayerAnnotatorOverlay": "._layer_annotator_overlay",
+    "VispyLayerAnnotatorOverlay": "._layer_annotator_overlay",
+    "TimestampOverlay": "._timestamp_overlay",
+    "VispyTimestampOverlay": "._timestamp_overlay",
+    "LayerAnnotationsWidget": "._widget",
+    "LayertoRGBWidget": "._widget",
+    "RenderRGBWidget": "._widget",
+    "TimestampWidget": "._widget",
+    "render_as_rgb": ".render_as_rgb",
+    "render_as_rgb_iter": ".render_as_rgb",
+    "save_image_stack": ".render_as_rgb",
+}
 
 __all__ = (
     "TimestampWidget",
@@ -26,5 +31,17 @@ __all__ = (
     "LayerAnnotatorOverlay",
     "VispyLayerAnnotatorOverlay",
     "render_as_rgb",
+    "render_as_rgb_iter",
     "save_image_stack",
 )
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -11,17 +11,18 @@ and the properties of the visuals.
 This structure is adapted from the napari dev example.
 """
 import contextlib
-from collections import defaultdict
 from typing import Literal
 
+import numpy as np
 from napari._vispy.overlays.base import ViewerOverlayMixin, VispySceneOverlay
 from napari.components.overlays import SceneOverlay
 from napari.layers import Image, labels
+from qtpy.QtCore import QTimer
 from vispy.color import ColorArray
 from vispy.visuals.transforms import STTransform
 
 from napari_timestamper.text_visual import TextWithBoxVisual
-from napari_timestamper.utils import _find_grid_offsets
+from napari_timestamper.utils import _find_grid_offsets, _overlap_counts
 
 try:
     from napari.utils.compat import StrEnum
@@ -36,6 +37,17 @@ except ImportError:
             return name
 
 
+# flags of the work that is pending for the next flush of the vispy overlay
+_DIRTY_POS = 1
+_DIRTY_SIZE = 2
+_DIRTY_PROPS = 4
+_DIRTY_ANN = 8
+_DIRTY_ZOOM = 16
+
+# below this number of labels the overlap correction is faster in pure python
+_VECTORIZED_OVERLAP_MIN_LABELS = 64
+
+
 class ScenePosition(StrEnum):
     """Canvas overlay position.
 
@@ -56,6 +68,63 @@ class ScenePosition(StrEnum):
     BOTTOM_LEFT = "bottom_left"
 
 
+# anchors, overlap direction and translation of the labels for each position,
+# the translation is computed from (x_max, y_max, x_size, y_size, x_spacer,
+# y_spacer)
+_POSITION_LAYOUTS = {
+    ScenePosition.TOP_LEFT: (
+        ("left", "bottom"),
+        "down",
+        lambda xm, ym, xs, ys, xsp, ysp: [xsp - 0.5, ysp - 0.5, 0, 0],
+    ),
+    ScenePosition.TOP_RIGHT: (
+        ("right", "bottom"),
+        "down",
+        lambda xm, ym, xs, ys, xsp, ysp: [
+            xm - xs - xsp + 0.5,
+            ysp - 0.5,
+            0,
+            0,
+        ],
+    ),
+    ScenePosition.TOP_CENTER: (
+        ("center", "bottom"),
+        "down",
+        lambda xm, ym, xs, ys, xsp, ysp: [xm / 2 - xs / 2, ysp - 0.5, 0, 0],
+    ),
+    ScenePosition.BOTTOM_RIGHT: (
+        ("right", "top"),
+        "up",
+        lambda xm, ym, xs, ys, xsp, ysp: [
+            xm - xs - xsp + 0.5,
+            ym - ys - ysp + 0.5,
+            0,
+            0,
+        ],
+    ),
+    ScenePosition.BOTTOM_CENTER: (
+        ("center", "top"),
+        "up",
+        lambda xm, ym, xs, ys, xsp, ysp: [
+            xm / 2 - xs / 2,
+            ym - ys - ysp + 0.5,
+            0,
+            0,
+        ],
+    ),
+    ScenePosition.BOTTOM_LEFT: (
+        ("left", "top"),
+        "up",
+        lambda xm, ym, xs, ys, xsp, ysp: [
+            xsp - 0.5,
+            ym - ys - ysp + 0.5,
+            0,
+            0,
+        ],
+    ),
+}
+
+
 class LayerAnnotatorOverlay(SceneOverlay):
     """
     Timestamp Overlay.
@@ -109,129 +178,350 @@ class VispyLayerAnnotatorOverlay(ViewerOverlayMixin, VispySceneOverlay):
         self.x_size = 0
         self.y_size = 0
         self.node.transform = STTransform()
+        # rgba rows of the annotated layers, only rows whose layer or
+        # colormap changed are re-parsed in _update_annotations
+        self._color_cache = np.empty((8, 4), dtype=np.float32)
+        self._color_key_cache = []
+        # last colormap color of each layer, keyed by the layer id and
+        # invalidated by the colormap event of the layer
+        self._layer_colors = {}
+        self._annotation_signature = None
+        # reusable buffer for the label positions and the inputs of the last
+        # update_data call, see _on_position_change
+        self._pos_buffer = np.empty((8, 2), dtype=np.float32)
+        self._last_update_signature = {}
+        # derived overlay properties, refreshed by the events that change them
+        self._bg_rgba = self.overlay.bg_color.rgba.tolist()
+        self._text_color = self._get_text_color()
+        # values last set on the visual by _on_property_change
+        self._node_properties = {}
+
+        # bursts of events are coalesced into a single update per event
+        # loop tick, see _schedule and _flush
+        self._dirty = 0
+        self._batching = False
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self._flush)
 
         # setup callbacks
         self.overlay.events.layers_to_annotate.connect(
-            self._on_property_change
+            self._on_text_color_change
         )
-        self.overlay.events.size.connect(self._on_size_change)
-        self.overlay.events.position.connect(self._on_position_change)
+        self.overlay.events.size.connect(self._schedule_size)
+        self.overlay.events.position.connect(self._schedule_position)
         self.overlay.events.y_spacer.connect(self._update_offsets)
         self.overlay.events.x_spacer.connect(self._update_offsets)
-        self.overlay.events.color.connect(self._on_property_change)
-        self.overlay.events.use_layer_color.connect(self._on_property_change)
-        self.overlay.events.bold.connect(self._on_property_change)
-        self.overlay.events.italic.connect(self._on_property_change)
-        self.overlay.events.bg_color.connect(self._on_property_change)
-        self.overlay.events.show_background.connect(self._on_property_change)
-        self.overlay.events.show_outline.connect(self._on_property_change)
-        self.overlay.events.outline_color.connect(self._on_property_change)
-        self.overlay.events.outline_thickness.connect(self._on_property_change)
+        self.overlay.events.color.connect(self._on_text_color_change)
+        self.overlay.events.use_layer_color.connect(
+            self._on_text_color_change
+        )
+        self.overlay.events.bold.connect(self._schedule_properties)
+        self.overlay.events.italic.connect(self._schedule_properties)
+        self.overlay.events.bg_color.connect(self._on_bg_color_change)
+        self.overlay.events.show_background.connect(self._schedule_properties)
+        self.overlay.events.show_outline.connect(self._schedule_properties)
+        self.overlay.events.outline_color.connect(self._schedule_properties)
+        self.overlay.events.outline_thickness.connect(
+            self._schedule_properties
+        )
         self.viewer.camera.events.zoom.connect(self._on_viewer_zoom_change)
         self.viewer.layers.events.inserted.connect(self._on_new_layer_added)
-        self.viewer.layers.events.reordered.connect(self._update_annotations)
-        self.viewer.layers.events.removed.connect(self._update_annotations)
-        self.viewer.grid.events.shape.connect(self._update_annotations)
-        self.viewer.grid.events.stride.connect(self._update_annotations)
-        self.viewer.grid.events.enabled.connect(self._update_annotations)
-        self.viewer.dims.events.ndisplay.connect(self._on_property_change)
+        self.viewer.layers.events.reordered.connect(self._schedule_annotations)
+        self.viewer.layers.events.removed.connect(self._on_layer_removed)
+        self.viewer.grid.events.shape.connect(self._schedule_annotations)
+        self.viewer.grid.events.stride.connect(self._schedule_annotations)
+        self.viewer.grid.events.enabled.connect(self._schedule_annotations)
+        self.viewer.dims.events.ndisplay.connect(self._schedule_properties)
 
         self.reset()
         self._connect_iniial_layers()
 
+    def close(self):
+        """
+        Disconnects the viewer and layer events connected in __init__, the
+        base class only disconnects the overlay events.
+        """
+        self._flush_timer.stop()
+        self.viewer.camera.events.zoom.disconnect(self._on_viewer_zoom_change)
+        self.viewer.layers.events.inserted.disconnect(
+            self._on_new_layer_added
+        )
+        self.viewer.layers.events.reordered.disconnect(
+            self._schedule_annotations
+        )
+        self.viewer.layers.events.removed.disconnect(self._on_layer_removed)
+        self.viewer.grid.events.shape.disconnect(self._schedule_annotations)
+        self.viewer.grid.events.stride.disconnect(self._schedule_annotations)
+        self.viewer.grid.events.enabled.disconnect(self._schedule_annotations)
+        self.viewer.dims.events.ndisplay.disconnect(self._schedule_properties)
+        for layer in self.viewer.layers:
+            self._disconnect_layer(layer)
+        super().close()
+
+    def _schedule(self, flags):
+        """
+        Marks `flags` as dirty and schedules a flush on the next event loop
+        tick, so that a burst of events results in a single update.
+        """
+        self._dirty |= flags
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _schedule_annotations(self, event=None):
+        self._schedule(_DIRTY_ANN)
+
+    def _schedule_properties(self, event=None):
+        self._schedule(_DIRTY_PROPS)
+
+    def _schedule_size(self, event=None):
+        self._schedule(_DIRTY_SIZE)
+
+    def _schedule_position(self, event=None):
+        self._schedule(_DIRTY_POS)
+
+    def _flush(self):
+        """
+        Runs the pending updates once, in dependency order.
+        """
+        self._flush_timer.stop()
+        dirty, self._dirty = self._dirty, 0
+        if dirty & _DIRTY_ANN:
+            self._update_annotations()
+            # the new annotations mark the properties as dirty
+            dirty |= self._dirty
+            self._dirty = 0
+            self._flush_timer.stop()
+
+        # each stage cascades into the ones below it
+        if dirty & _DIRTY_PROPS:
+            self._on_property_change()
+        elif dirty & _DIRTY_SIZE:
+            self._on_size_change()
+        else:
+            if dirty & _DIRTY_ZOOM:
+                self._apply_font_scale()
+            if dirty & _DIRTY_POS:
+                self._on_position_change()
+
+    def _get_text_color(self):
+        """
+        Returns the color of the labels, either the layer colors or the
+        overlay color.
+        """
+        if self.overlay.use_layer_color:
+            return self.overlay.layers_to_annotate["colors"]
+        return self.overlay.color
+
+    def _on_text_color_change(self, event=None):
+        """
+        Callback function for when the color of the labels is changed.
+        """
+        self._text_color = self._get_text_color()
+        self._schedule_properties()
+
+    def _on_bg_color_change(self, event=None):
+        """
+        Callback function for when the background color is changed.
+        """
+        self._bg_rgba = self.overlay.bg_color.rgba.tolist()
+        self._schedule_properties()
+
     def _update_offsets(self, event=None):
         """
         Callback function for when the offsets of the overlay are changed.
         """
         self.x_spacer = self.overlay.x_spacer
         self.y_spacer = self.overlay.y_spacer
-        self._on_position_change()
+        self._schedule_position()
 
     def _connect_iniial_layers(self):
         """
         Connects the initial layers to the overlay.
         """
         for layer in self.viewer.layers:
-            layer.events.visible.connect(self._update_annotations)
-            layer.events.name.connect(self._update_annotations)
-            with contextlib.suppress(AttributeError):
-                layer.events.colormap.connect(self._update_annotations)
+            self._connect_layer(layer)
+
+    def _connect_layer(self, layer):
+        """
+        Connects the events of a layer that change its annotation.
+        """
+        layer.events.visible.connect(self._schedule_annotations)
+        layer.events.name.connect(self._schedule_annotations)
+        layer.events.data.connect(self._on_layer_extent_change)
+        layer.events.scale.connect(self._on_layer_extent_change)
+        layer.events.translate.connect(self._on_layer_extent_change)
+        with contextlib.suppress(AttributeError):
+            layer.events.colormap.connect(self._on_layer_colormap_change)
+
+    def _disconnect_layer(self, layer):
+        """
+        Disconnects the events connected in _connect_layer.
+        """
+        layer.events.visible.disconnect(self._schedule_annotations)
+        layer.events.name.disconnect(self._schedule_annotations)
+        layer.events.data.disconnect(self._on_layer_extent_change)
+        layer.events.scale.disconnect(self._on_layer_extent_change)
+        layer.events.translate.disconnect(self._on_layer_extent_change)
+        with contextlib.suppress(AttributeError):
+            layer.events.colormap.disconnect(self._on_layer_colormap_change)
+        self._layer_colors.pop(id(layer), None)
+
+    def _on_layer_colormap_change(self, event):
+        """
+        Callback function for when the colormap of a layer is changed.
+        """
+        self._layer_colors.pop(id(event.source), None)
+        self._annotation_signature = None
+        self._schedule_annotations()
+
+    def _on_layer_extent_change(self, event=None):
+        """
+        Callback function for when the data, scale or translation of a layer
+        is changed, which the widths and offsets of the labels depend on.
+        """
+        self._annotation_signature = None
+        self._schedule_annotations()
 
     def _on_new_layer_added(self, event=None):
         """
         Callback function for when a new layer is added to the viewer.
         """
-        layer = event.value
-        layer.events.visible.connect(self._update_annotations)
-        layer.events.name.connect(self._update_annotations)
-        with contextlib.suppress(AttributeError):
-            layer.events.colormap.connect(self._update_annotations)
+        self._connect_layer(event.value)
+        self._schedule_annotations()
 
-        self._update_annotations()
+    def _on_layer_removed(self, event=None):
+        """
+        Callback function for when a layer is removed from the viewer.
+        """
+        self._disconnect_layer(event.value)
+        # a new layer may reuse the id of the removed one
+        self._annotation_signature = None
+        self._schedule_annotations()
 
     def _update_annotations(self):
         """
         Function for when a layer is added or removed from the viewer.
         """
-        layers_to_annotate = defaultdict(list)
-        layer_translations = _find_grid_offsets(
-            self.viewer
-        )  # Get grid offsets
-        layer_translations.reverse()  # Reverse order to match layer order
-
-        for i, layer in enumerate(self.viewer.layers[::-1]):
-            if layer.visible:
-                layers_to_annotate["layer_names"].append(layer.name)
-                if isinstance(layer, labels.Labels):
-                    layers_to_annotate["colors"].append(self.overlay.color)
-                else:
-                    try:
-                        layers_to_annotate["colors"].append(
-                            layer.colormap.colors[-1]
-                        )
-                    except AttributeError:
-                        layers_to_annotate["colors"].append(self.overlay.color)
-
-                # Update offsets based on grid position
-                grid_offset = layer_translations[i]
-                layers_to_annotate["y_offsets"].append(grid_offset[-2])
-
-                layers_to_annotate["x_offsets"].append(grid_offset[-1])
-                if not isinstance(layer, (Image, labels.Labels)):
-                    extent = self.viewer._sliced_extent_world
-                    layers_to_annotate["layer_widths"].append(
-                        extent[1][-2] - extent[0][-2]
-                    )
-                else:
-                    layers_to_annotate["layer_widths"].append(
-                        layer.data.shape[-2:][0]
-                    )
+        layers = self.viewer.layers
+        grid = self.viewer.grid
+        # state the annotations are derived from, the layer extents aren't
+        # part of it, their changes and the colormap changes reset it
+        signature = (
+            tuple((id(layer), layer.visible, layer.name) for layer in layers),
+            grid.enabled,
+            tuple(grid.shape),
+            grid.stride,
+            self.overlay.color,
+        )
+        if signature == self._annotation_signature:
+            return
+        self._annotation_signature = signature
+
+        # indices of the visible layers from top to bottom, walked without
+        # copying the layer list
+        visible_indices = [
+            layer_index
+            for layer_index in range(len(layers) - 1, -1, -1)
+            if layers[layer_index].visible
+        ]
+        if not visible_indices:
+            self.overlay.layers_to_annotate = {
+                "layer_names": [],
+                "y_offsets": [],
+                "x_offsets": [],
+                "layer_widths": [],
+                "colors": ColorArray(["white"]),
+            }
+            return
+
+        # Get grid offsets of all visible layers at once
+        grid_offsets = _find_grid_offsets(self.viewer)[visible_indices]
+        layer_names = []
+        layer_widths = []
+        for row, layer_index in enumerate(visible_indices):
+            layer = layers[layer_index]
+            layer_names.append(layer.name)
+            self._cache_color(row, layer)
+            if not isinstance(layer, (Image, labels.Labels)):
+                extent = self.viewer._sliced_extent_world
+                layer_widths.append(extent[1][-2] - extent[0][-2])
+            else:
+                layer_widths.append(layer.data.shape[-2:][0])
+        n_colors = len(visible_indices)
+        del self._color_key_cache[n_colors:]
+
+        self.overlay.layers_to_annotate = {
+            "layer_names": layer_names,
+            "y_offsets": grid_offsets[:, 0].tolist(),
+            "x_offsets": grid_offsets[:, 1].tolist(),
+            "layer_widths": layer_widths,
+            "colors": ColorArray(self._color_cache[:n_colors]),
+        }
+
+    def _cache_color(self, row, layer):
+        """
+        Writes the annotation color of a layer into row `row` of the color
+        cache, skipping the color parsing if the row is still up to date.
+        """
+        if isinstance(layer, labels.Labels):
+            color = self.overlay.color
+        else:
+            color = self._layer_colors.get(id(layer))
+            if color is None:
+                try:
+                    color = tuple(layer.colormap.colors[-1])
+                except AttributeError:
+                    color = ()
+                self._layer_colors[id(layer)] = color
+            if not color:
+                color = self.overlay.color
+
+        key = (id(layer), color)
+
+        if row < len(self._color_key_cache):
+            if self._color_key_cache[row] == key:
+                return
+            self._color_key_cache[row] = key
+        else:
+            self._color_key_cache.append(key)
 
-        try:
-            layers_to_annotate["colors"] = ColorArray(
-                layers_to_annotate["colors"]
+        if row >= len(self._color_cache):
+            self._color_cache = np.resize(
+                self._color_cache, (2 * len(self._color_cache), 4)
             )
+        try:
+            self._color_cache[row] = ColorArray(color).rgba[0]
         except ValueError:
-            layers_to_annotate["colors"] = ColorArray(["white"])
-
-        self.overlay.layers_to_annotate = layers_to_annotate
+            self._color_cache[row] = ColorArray("white").rgba[0]
 
     def _on_viewer_zoom_change(self, event=None):
         """
         Callback function for when the viewer is zoomed.
         """
         self.camera_scale_factor = self.viewer.camera.zoom
-        self._on_size_change()
+        self._schedule(_DIRTY_ZOOM)
+
+    def _apply_font_scale(self):
+        """
+        Applies the camera zoom to the font and the outline.
+
+        The label positions do not depend on the zoom, so unlike
+        _on_size_change this does not recompute them.
+        """
+        self.node.font_scale_factor = self.camera_scale_factor
+        self.node.font_size = self.overlay.size
+        self.node.outline_thickness = self.overlay.outline_thickness
+        self.node.update_outline()
 
     def _on_position_change(self, event=None):
         """
         Callback function for when the position of the overlay is changed.
         """
         position = self.overlay.position
-        x_max, y_max = (
-            self.viewer.dims.range[-2][-2],
-            self.viewer.dims.range[-1][-2],
-        )
+        dims_range = self.viewer.dims.range
+        x_max, y_max = dims_range[-2][-2], dims_range[-1][-2]
 
         if len(self.overlay.layers_to_annotate["y_offsets"]) < 1:
             self.overlay.layers_to_annotate["y_offsets"] = [0]
@@ -240,102 +530,128 @@ class VispyLayerAnnotatorOverlay(ViewerOverlayMixin, VispySceneOverlay):
         if len(self.overlay.layers_to_annotate["layer_widths"]) < 1:
             self.overlay.layers_to_annotate["layer_widths"] = [0]
 
-        if position == ScenePosition.TOP_LEFT:
-            y_offsets, x_offsets = self.correct_offsets_for_overlap("down")
-            anchors = ("left", "bottom")
-            transform = [self.x_spacer - 0.5, self.y_spacer - 0.5, 0, 0]
-
-        elif position == ScenePosition.TOP_RIGHT:
-            y_offsets, x_offsets = self.correct_offsets_for_overlap("down")
-            anchors = ("right", "bottom")
-            transform = [
-                x_max - self.x_size - self.x_spacer + 0.5,
-                self.y_spacer - 0.5,
-                0,
-                0,
-            ]
-        elif position == ScenePosition.TOP_CENTER:
-            y_offsets, x_offsets = self.correct_offsets_for_overlap("down")
-            transform = [
-                x_max / 2 - self.x_size / 2,
-                self.y_spacer - 0.5,
-                0,
-                0,
-            ]
-            anchors = ("center", "bottom")
-
-        elif position == ScenePosition.BOTTOM_RIGHT:
-            y_offsets, x_offsets = self.correct_offsets_for_overlap("up")
-            anchors = ("right", "top")
-            transform = [
-                x_max - self.x_size - self.x_spacer + 0.5,
-                y_max - self.y_size - self.y_spacer + 0.5,
-                0,
-                0,
-            ]
-        elif position == ScenePosition.BOTTOM_LEFT:
-            y_offsets, x_offsets = self.correct_offsets_for_overlap("up")
-            anchors = ("left", "top")
-            transform = [
-                self.x_spacer - 0.5,
-                y_max - self.y_size - self.y_spacer + 0.5,
-                0,
-                0,
-            ]
-        elif position == ScenePosition.BOTTOM_CENTER:
-            y_offsets, x_offsets = self.correct_offsets_for_overlap("up")
-            anchors = ("center", "top")
-            transform = [
-                x_max / 2 - self.x_size / 2,
-                y_max - self.y_size - self.y_spacer + 0.5,
-                0,
-                0,
-            ]
+        anchors, direction, get_translation = _POSITION_LAYOUTS[
+            ScenePosition(position)
+        ]
+        y_offsets, x_offsets = self.correct_offsets_for_overlap(direction)
+        transform = get_translation(
+            x_max,
+            y_max,
+            self.x_size,
+            self.y_size,
+            self.x_spacer,
+            self.y_spacer,
+        )
         self.node.transform.translate = transform
         self.node.anchors = anchors
         self.node._rectagles_visual.spacer = self.x_spacer
 
-        self.node.update_data(
-            text=self.overlay.layers_to_annotate["layer_names"],
-            color=self.overlay.layers_to_annotate["colors"]
-            if self.overlay.use_layer_color
-            else self.overlay.color,
-            font_size=self.overlay.size,
-            pos=list(zip(x_offsets, y_offsets)),
-            box_width=self.overlay.layers_to_annotate["layer_widths"],
-            bgcolor=self.overlay.bg_color.rgba.tolist(),
-        )
+        n_labels = len(y_offsets)
+        if len(self._pos_buffer) < n_labels:
+            self._pos_buffer = np.resize(self._pos_buffer, (n_labels, 2))
+        pos = self._pos_buffer[:n_labels]
+        pos[:, 0] = x_offsets
+        pos[:, 1] = y_offsets
+
+        layers_to_annotate = self.overlay.layers_to_annotate
+        color = self._text_color
+        # the visual pads the color list in place, so pass a copy
+        bgcolor = list(self._bg_rgba)
+        text = layers_to_annotate["layer_names"]
+        signature = {
+            "text": tuple(text),
+            "color": (
+                color.rgba.tobytes()
+                if isinstance(color, ColorArray)
+                else color
+            ),
+            "geometry": (
+                anchors,
+                pos.tobytes(),
+                self.x_spacer,
+                self.node.font_scale_factor,
+                self.node.outline_thickness,
+                self.overlay.size,
+                tuple(layers_to_annotate["layer_widths"]),
+                str(bgcolor),
+            ),
+        }
+        last_signature = self._last_update_signature
+        self._last_update_signature = signature
+
+        # only the boxes and positions require a full upload to the visual,
+        # text and color can be set on their own
+        if signature["geometry"] != last_signature.get("geometry"):
+            self.node.update_data(
+                text=text,
+                color=color,
+                font_size=self.overlay.size,
+                pos=pos,
+                box_width=layers_to_annotate["layer_widths"],
+                bgcolor=bgcolor,
+            )
+            return
+        if signature["text"] != last_signature.get("text"):
+            self.node.text = text
+        if signature["color"] != last_signature.get("color"):
+            self.node.color = color
 
     def correct_offsets_for_overlap(
         self, movement_direction: Literal["up", "down"] = "down"
     ):
-        existing_offsets = []
-        y_offsets = self.overlay.layers_to_annotate["y_offsets"].copy()
-        x_offsets = self.overlay.layers_to_annotate["x_offsets"].copy()
-        for idx, (y, x) in enumerate(
-            zip(
-                self.overlay.layers_to_annotate["y_offsets"],
-                self.overlay.layers_to_annotate["x_offsets"],
+        layers_to_annotate = self.overlay.layers_to_annotate
+        y_offsets = list(layers_to_annotate["y_offsets"])
+        x_offsets = list(layers_to_annotate["x_offsets"])
+        if len(y_offsets) < 2:
+            return y_offsets, x_offsets
+
+        shift = 1.75 * self.overlay.size
+        if movement_direction == "up":
+            shift = -shift
+
+        grid_cells = self._find_grid_cells(y_offsets, x_offsets)
+        if grid_cells is not None:
+            # number of labels already placed in each grid cell
+            counts = [0] * (max(grid_cells) + 1)
+            for idx, cell in enumerate(grid_cells):
+                y_offsets[idx] += shift * counts[cell]
+                counts[cell] += 1
+            return y_offsets, x_offsets
+
+        if len(y_offsets) > _VECTORIZED_OVERLAP_MIN_LABELS:
+            y_offsets = np.asarray(y_offsets, dtype=float) + shift * (
+                _overlap_counts(y_offsets, x_offsets)
             )
-        ):
-            if (y, x) in existing_offsets:
-                if movement_direction == "down":
-                    y_offsets[idx] += (
-                        1.75
-                        * self.overlay.size
-                        * existing_offsets.count((y, x))
-                    )
-                    # y_offsets[idx] -= self.overlay.outline_thickness
-                elif movement_direction == "up":
-                    y_offsets[idx] -= (
-                        1.75
-                        * self.overlay.size
-                        * existing_offsets.count((y, x))
-                    )
-                    # y_offsets[idx] += self.overlay.outline_thickness
-            existing_offsets.append((y, x))
+            return y_offsets.tolist(), x_offsets
+
+        # number of labels already placed at each (y, x) position, the
+        # first label at a position is shifted by 0
+        counts = {}
+        for idx, key in enumerate(zip(y_offsets, x_offsets)):
+            count = counts.get(key, 0)
+            y_offsets[idx] = key[0] + shift * count
+            counts[key] = count + 1
         return y_offsets, x_offsets
 
+    def _find_grid_cells(self, y_offsets, x_offsets):
+        """
+        Returns the index of the grid cell of each label, or None if the
+        viewer is not in grid mode and the labels are not on a grid.
+        """
+        grid = self.viewer.grid
+        if not grid.enabled:
+            return None
+        extent = self.viewer._sliced_extent_world_augmented
+        shift_y, shift_x = (extent[1] - extent[0])[-2:]
+        if shift_y == 0 or shift_x == 0:
+            return None
+        n_columns = grid.actual_shape(len(self.viewer.layers))[1]
+        rows = np.rint(np.asarray(y_offsets) / shift_y).astype(int)
+        columns = np.rint(np.asarray(x_offsets) / shift_x).astype(int)
+        if rows.min() < 0 or columns.min() < 0:
+            return None
+        return (rows * n_columns + columns).tolist()
+
     def _on_size_change(self, event=None):
         """
         Callback function for when the size of the overlay is changed.
@@ -344,39 +660,61 @@ class VispyLayerAnnotatorOverlay(ViewerOverlayMixin, VispySceneOverlay):
         self.node.font_scale_factor = self.camera_scale_factor
         self.node.font_size = self.overlay.size
         self.node.outline_thickness = self.overlay.outline_thickness
-        self._on_position_change()
+        if not self._batching:
+            self._on_position_change()
 
     def _on_property_change(self, event=None):
         """
         Callback function for when properties of the overlay are changed.
         """
+        overlay = self.overlay
+        set_property = self._set_node_property
         # self._update_annotations()
         if self.viewer.dims.ndisplay == 3:
-            self.node.show_outline = False
-            self.node._rectagles_visual.visible = False
-        else:
-            self.node.show_outline = self.overlay.show_outline
-            self.node._rectagles_visual.visible = self.overlay.show_background
-
-        self.node.text = self.overlay.layers_to_annotate["layer_names"]
-        self.node.bold = self.overlay.bold
-        self.node.italic = self.overlay.italic
-        self.node.outline_color = self.overlay.outline_color
-        self.node.outline_thickness = self.overlay.outline_thickness
-        self.node.bgcolor = self.overlay.bg_color.rgba.tolist()
-        if self.overlay.use_layer_color:
-            self.node.color = self.overlay.layers_to_annotate["colors"]
+            set_property("show_outline", False)
+            set_property("show_background", False)
         else:
-            self.node.color = self.overlay.color
-        self._on_size_change()
+            set_property("show_outline", overlay.show_outline)
+            set_property("show_background", overlay.show_background)
+
+        set_property("text", overlay.layers_to_annotate["layer_names"])
+        set_property("bold", overlay.bold)
+        set_property("italic", overlay.italic)
+        set_property("outline_color", overlay.outline_color)
+        set_property("bgcolor", self._bg_rgba)
+        set_property("color", self._text_color)
+        if not self._batching:
+            self._on_size_change()
+
+    def _set_node_property(self, name, value):
+        """
+        Sets a property of the visual, unless it was already set to the same
+        value by _on_property_change.
+        """
+        if name in self._node_properties and (
+            self._node_properties[name] == value
+        ):
+            return
+        self._node_properties[name] = value
+        # the visual pads color lists in place, so pass a copy
+        setattr(self.node, name, list(value) if name == "bgcolor" else value)
 
     def reset(self):
         """
         Resets the overlay to its initial state.
         """
         super().reset()
-        self._on_property_change()
-        self._on_size_change()
+        # run every stage once in dependency order instead of letting each
+        # of them cascade into the following ones
+        self._batching = True
+        try:
+            self._update_annotations()
+            self._on_viewer_zoom_change()
+            self._on_property_change()
+            self._on_size_change()
+        finally:
+            self._batching = False
         self._on_position_change()
-        self._on_viewer_zoom_change()
-        self._update_annotations()
+        # everything scheduled in the meantime is up to date now
+        self._dirty = 0
+        self._flush_timer.stop()
@@ -0,0 +1,92 @@
+import os
+
+import napari
+import numpy as np
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--cached",
+        action="store_true",
+        default=False,
+        help="reuse the random test images stored in the pytest cache",
+    )
+
+
+def _random_image(config, rng, name, shape):
+    """
+    Returns a read-only random image, loaded from the pytest cache if the
+    tests run with --cached.
+    """
+    if config.getoption("--cached"):
+        path = config.cache.mkdir("napari_timestamper") / f"{name}.npy"
+        if path.exists():
+            image = np.load(path)
+        else:
+            image = rng.random(shape)
+            # workers may write concurrently, so write to a temporary file
+            tmp_path = path.with_name(f"{name}.{os.getpid()}.npy")
+            np.save(tmp_path, image)
+            os.replace(tmp_path, path)
+    else:
+        image = rng.random(shape)
+    image.flags.writeable = False
+    return image
+
+
+@pytest.fixture(scope="module")
+def shared_viewer(qapp):
+    """
+    A napari viewer that is shared by all tests of a module.
+    """
+    viewer = napari.Viewer(show=False)
+    yield viewer
+    viewer.close()
+
+
+@pytest.fixture
+def viewer(shared_viewer):
+    """
+    The shared viewer, restored to an empty state after the test.
+    """
+    yield shared_viewer
+    shared_viewer.window.remove_dock_widget("all")
+    shared_viewer.layers.clear()
+    shared_viewer.grid.enabled = False
+    shared_viewer.grid.stride = 1
+    # remove the overlays added by the test together with their visuals
+    canvas = shared_viewer.window._qt_viewer.canvas
+    for name in list(shared_viewer._overlays):
+        if name not in ("timestamp", "LayerAnnotator"):
+            continue
+        overlay = shared_viewer._overlays.pop(name)
+        visuals = canvas._overlay_to_visual.pop(overlay, [])
+        if not isinstance(visuals, list):
+            visuals = [visuals]
+        for visual in visuals:
+            visual.close()
+
+
+@pytest.fixture(scope="session")
+def rng():
+    """
+    A seeded random generator shared by all tests.
+    """
+    return np.random.default_rng(1234)
+
+
+@pytest.fixture(scope="session")
+def small_cube(pytestconfig, rng):
+    """
+    A read-only (10, 10, 10) random image shared by all tests.
+    """
+    return _random_image(pytestconfig, rng, "small_cube", (10, 10, 10))
+
+
+@pytest.fixture(scope="session")
+def big_cube(pytestconfig, rng):
+    """
+    A read-only (10, 800, 800) random image shared by all tests.
+    """
+    return _random_image(pytestconfig, rng, "big_cube", (10, 800, 800))
@@ -1,7 +1,6 @@
 import warnings
 from unittest.mock import patch
 
-import numpy as np
 import pytest
 from napari._vispy.utils.visual import overlay_to_visual
 from vispy.color import ColorArray
@@ -12,15 +11,28 @@ from napari_timestamper._layer_annotator_overlay import (
 )
 
 
+@pytest.fixture(scope="module", autouse=True)
+def register_overlay_visual():
+    previous = overlay_to_visual.get(LayerAnnotatorOverlay)
+    overlay_to_visual[LayerAnnotatorOverlay] = VispyLayerAnnotatorOverlay
+    yield
+    if previous is None:
+        overlay_to_visual.pop(LayerAnnotatorOverlay, None)
+    else:
+        overlay_to_visual[LayerAnnotatorOverlay] = previous
+
+
 @pytest.fixture
 def overlay():
     return LayerAnnotatorOverlay()
 
 
 @pytest.fixture
-def vispy_overlay(overlay, make_napari_viewer):
-    viewer = make_napari_viewer()
-    return VispyLayerAnnotatorOverlay(viewer=viewer, overlay=overlay)
+def vispy_overlay(overlay, viewer):
+    vispy_overlay = VispyLayerAnnotatorOverlay(viewer=viewer, overlay=overlay)
+    yield vispy_overlay
+    # the viewer is shared by the module, don't leave the visual connected
+    vispy_overlay.close()
 
 
 def test_init(vispy_overlay):
@@ -44,8 +56,9 @@ def test_on_size_change(vispy_overlay):
     assert vispy_overlay.node.font_size == 15
 
 
-def test_on_property_change(vispy_overlay):
-    vispy_overlay.viewer.add_image(np.random.random((10, 10)), name="Layer1")
+def test_on_property_change(vispy_overlay, rng):
+    vispy_overlay.viewer.add_image(rng.random((10, 10)), name="Layer1")
+    vispy_overlay._flush()
     # vispy_overlay.overlay.layers_to_annotate["layer_names"] = ["Layer1"]
     assert vispy_overlay.node.color != ColorArray("red")
     vispy_overlay.overlay.color = "red"
@@ -74,9 +87,11 @@ def test_reset(vispy_overlay):
     mock_update_annotations.assert_called_once()
 
 
-def test_add_overlay_to_viewer(make_napari_viewer):
-    viewer = make_napari_viewer()
-    with warnings.catch_warnings():
+def test_add_overlay_to_viewer(viewer):
+    canvas = viewer.window._qt_viewer.canvas
+    with warnings.catch_warnings(), patch.object(
+        canvas, "_add_overlay_to_visual"
+    ) as mock_add_overlay_to_visual:
         warnings.simplefilter("ignore")
         try:
             viewer._overlays["LayerAnnotator"]
@@ -84,12 +99,62 @@ def test_add_overlay_to_viewer(make_napari_viewer):
             viewer._overlays["LayerAnnotator"] = LayerAnnotatorOverlay(
                 visible=True
             )
-            overlay_to_visual[
-                LayerAnnotatorOverlay
-            ] = VispyLayerAnnotatorOverlay
-            viewer.window._qt_viewer.canvas._add_overlay_to_visual(
-                viewer._overlays["LayerAnnotator"]
-            )
+            canvas._add_overlay_to_visual(viewer._overlays["LayerAnnotator"])
         layer_annotator_overlay = viewer._overlays["LayerAnnotator"]
 
+    mock_add_overlay_to_visual.assert_called_once_with(layer_annotator_overlay)
     assert isinstance(layer_annotator_overlay, LayerAnnotatorOverlay)
+
+
+def test_update_annotations_colors(vispy_overlay, rng):
+    vispy_overlay.viewer.add_image(
+        rng.random((10, 10)), name="Layer1", colormap="red"
+    )
+    vispy_overlay.viewer.add_image(
+        rng.random((10, 10)), name="Layer2", colormap="green"
+    )
+    vispy_overlay._flush()
+    colors = vispy_overlay.overlay.layers_to_annotate["colors"]
+    assert colors == ColorArray([(0, 1, 0, 1), (1, 0, 0, 1)])
+
+    vispy_overlay.viewer.layers["Layer2"].colormap = "blue"
+    vispy_overlay._flush()
+    colors = vispy_overlay.overlay.layers_to_annotate["colors"]
+    assert colors == ColorArray([(0, 0, 1, 1), (1, 0, 0, 1)])
+
+
+def test_layer_data_change_updates_annotations(vispy_overlay, rng):
+    layer = vispy_overlay.viewer.add_image(rng.random((10, 10)))
+    vispy_overlay._flush()
+    assert vispy_overlay.overlay.layers_to_annotate["layer_widths"] == [10]
+    layer.data = rng.random((20, 20))
+    vispy_overlay._flush()
+    assert vispy_overlay.overlay.layers_to_annotate["layer_widths"] == [20]
+
+
+def test_events_are_coalesced(vispy_overlay, qtbot):
+    with patch.object(
+        vispy_overlay, "_on_property_change"
+    ) as mock_property_change:
+        vispy_overlay.overlay.bold = True
+        vispy_overlay.overlay.italic = True
+        vispy_overlay.overlay.color = "red"
+        mock_property_change.assert_not_called()
+        qtbot.waitUntil(lambda: mock_property_change.called)
+    mock_property_change.assert_called_once()
+
+
+def test_removed_layer_is_disconnected(vispy_overlay, rng):
+    layer = vispy_overlay.viewer.add_image(rng.random((10, 10)))
+    with patch.object(
+        vispy_overlay, "_schedule_annotations"
+    ) as mock_schedule:
+        layer.name = "renamed"
+        mock_schedule.assert_called()
+    vispy_overlay.viewer.layers.remove(layer)
+    with patch.object(
+        vispy_overlay, "_schedule_annotations"
+    ) as mock_schedule:
+        layer.name = "removed"
+        layer.visible = False
+        mock_schedule.assert_not_called()
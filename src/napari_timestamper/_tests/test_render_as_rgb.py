@@ -1,11 +1,13 @@
 import numpy as np
 
-from napari_timestamper.render_as_rgb import render_as_rgb
+from napari_timestamper.render_as_rgb import (
+    render_as_rgb,
+    render_as_rgb_iter,
+)
 
 
-def test_render_as_rgb(make_napari_viewer):
-    viewer = make_napari_viewer()
-    viewer.add_image(np.random.random((10, 10, 10)))
+def test_render_as_rgb(viewer, small_cube):
+    viewer.add_image(small_cube)
 
     # Test with default parameters
     result = render_as_rgb(viewer)
@@ -19,4 +21,11 @@ def test_render_as_rgb(make_napari_viewer):
     # Test with specified upsample_factor
     result = render_as_rgb(viewer, upsample_factor=2)
     assert result.shape == (20, 20, 4)
-    viewer.close()
+
+
+def test_render_as_rgb_iter(viewer, small_cube):
+    viewer.add_image(small_cube)
+    frames = list(render_as_rgb_iter(viewer, 0))
+    assert len(frames) == 10
+    assert all(frame.shape == (10, 10, 4) for frame in frames)
+    assert np.array_equal(np.stack(frames), render_as_rgb(viewer, axis=0))
@@ -1,11 +1,25 @@
 import warnings
+from unittest.mock import patch
 
+import pytest
 from napari._vispy.utils.visual import overlay_to_visual
 
 from napari_timestamper._timestamp_overlay import (
     TimestampOverlay,
     VispyTimestampOverlay,
+    _format_timestamp_cached,
 )
+from napari_timestamper.utils import _find_grid_offsets
+
+
+@pytest.fixture
+def vispy_overlay(viewer):
+    vispy_overlay = VispyTimestampOverlay(
+        overlay=TimestampOverlay(), viewer=viewer
+    )
+    yield vispy_overlay
+    # the viewer is shared by the module, don't leave the visual connected
+    vispy_overlay.close()
 
 
 def test_timestamp_overlay():
@@ -13,10 +27,7 @@ def test_timestamp_overlay():
     assert overlay is not None
 
 
-def test_text_instantiation(make_napari_viewer):
-    viewer = make_napari_viewer()
-    model = TimestampOverlay()
-    VispyTimestampOverlay(overlay=model, viewer=viewer)
+def test_text_instantiation(viewer, vispy_overlay):
     # add overlay to viewer
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
@@ -31,3 +42,116 @@ def test_text_instantiation(make_napari_viewer):
         timestamp_overlay = viewer._overlays["timestamp"]
 
     assert isinstance(timestamp_overlay, TimestampOverlay)
+
+
+def test_format_timestamp():
+    overlay = TimestampOverlay(time=3, start_time=3600, step_size=1.5)
+    assert overlay._format_timestamp(3, "HH:MM:SS") == "01:00:04"
+    assert overlay._format_timestamp(3, "HH:MM:SS.ss") == "01:00:04.50"
+    assert overlay._format_timestamp(3, "H:M") == "1:0"
+    assert overlay._format_timestamp(3, "MM:SS.ss") == "00:04.50"
+    assert overlay._format_timestamp(3, "SS") == "03"
+    assert overlay._format_timestamp(3, "F") == "3"
+    with pytest.raises(ValueError):
+        overlay._format_timestamp(3, "invalid")
+    hits = _format_timestamp_cached.cache_info().hits
+    assert overlay._format_timestamp(3, "F") == "3"
+    assert _format_timestamp_cached.cache_info().hits == hits + 1
+
+
+def test_timestamp_string_cache():
+    overlay = TimestampOverlay(time_format="SS", custom_suffix="s")
+    assert overlay.text == " 00 s"
+    overlay.time = 12
+    assert overlay.text == " 12 s"
+    overlay.prefix = "t ="
+    assert overlay.text == "t = 12 s"
+
+
+@pytest.mark.parametrize("time_format", ["HH:MM:SS.ss", "MM:SS", "SS", "F"])
+def test_precompute_timestamps(time_format):
+    overlay = TimestampOverlay(
+        time_format=time_format, start_time=3590, step_size=2.5, prefix="t"
+    )
+    expected = []
+    for time in range(5):
+        overlay.time = time
+        expected.append(overlay.text)
+    assert (
+        TimestampOverlay.precompute_strings(
+            5,
+            start_time=3590,
+            step_size=2.5,
+            time_format=time_format,
+            prefix="t",
+        )
+        == expected
+    )
+    overlay.precompute_timestamps(5)
+    overlay.time = 3
+    assert overlay.text == expected[3]
+
+
+def test_events_are_coalesced(viewer, vispy_overlay, qtbot):
+    with patch.object(vispy_overlay, "_on_text_change") as mock_text_change:
+        vispy_overlay.overlay.bold = True
+        vispy_overlay.overlay.prefix = "t ="
+        vispy_overlay.overlay.time_format = "SS"
+        mock_text_change.assert_not_called()
+        qtbot.waitUntil(lambda: mock_text_change.called)
+    mock_text_change.assert_called_once()
+
+
+def test_time_change_ignores_other_axes(viewer, vispy_overlay, rng):
+    viewer.add_image(rng.random((3, 4, 10, 10)))
+    with patch.object(vispy_overlay, "_set_node_property") as mock_set:
+        viewer.dims.set_current_step(1, 2)
+        mock_set.assert_not_called()
+        viewer.dims.set_current_step(0, 2)
+        mock_set.assert_called_once_with("text", vispy_overlay.overlay.text)
+    assert vispy_overlay.overlay.time == 2
+
+
+def test_max_grid_offset_cache(viewer, vispy_overlay, rng):
+    viewer.add_image(rng.random((10, 10)))
+    viewer.add_image(rng.random((10, 10)))
+    viewer.grid.enabled = True
+    max_offset = vispy_overlay._max_grid_offset()
+    assert max_offset == _find_grid_offsets(viewer).max(axis=0).tolist()
+    viewer.add_image(rng.random((10, 10)))
+    assert vispy_overlay._grid_offset_max is None
+    assert vispy_overlay._max_grid_offset()[0] > max_offset[0]
+
+
+def test_close_disconnects_viewer_events(viewer, rng):
+    vispy_overlay = VispyTimestampOverlay(
+        overlay=TimestampOverlay(), viewer=viewer
+    )
+    vispy_overlay.close()
+    with patch.object(vispy_overlay, "_schedule") as mock_schedule:
+        viewer.grid.enabled = True
+        viewer.add_image(rng.random((10, 10)))
+        mock_schedule.assert_not_called()
+
+
+def test_zoom_disconnected_for_fixed_canvas_overlay(viewer, monkeypatch):
+    overlay = TimestampOverlay(visible=True)
+    viewer._overlays["timestamp"] = overlay
+    monkeypatch.setitem(
+        overlay_to_visual, TimestampOverlay, VispyTimestampOverlay
+    )
+    canvas = viewer.window._qt_viewer.canvas
+    canvas._add_overlay_to_visual(overlay)
+    vispy_overlay = canvas._overlay_to_visual[overlay]
+    if isinstance(vispy_overlay, list):
+        vispy_overlay = vispy_overlay[0]
+    assert vispy_overlay._zoom_connected
+
+    overlay.scale_with_zoom = False
+    overlay.display_on_scene = False
+    vispy_overlay._flush()
+    assert not vispy_overlay._zoom_connected
+
+    overlay.display_on_scene = True
+    vispy_overlay._flush()
+    assert vispy_overlay._zoom_connected
@@ -0,0 +1,30 @@
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+
+from napari_timestamper.utils import _find_grid_offsets, _overlap_counts
+
+
+def test_find_grid_offsets(viewer, rng):
+    for _ in range(5):
+        viewer.add_image(rng.random((10, 20)))
+    assert_allclose(_find_grid_offsets(viewer), 0)
+
+    viewer.grid.enabled = True
+    viewer.grid.stride = -2
+    extent = viewer._sliced_extent_world_augmented
+    scene_shift = (extent[1] - extent[0])[-2:]
+    n_layers = len(viewer.layers)
+    expected = [
+        np.multiply(
+            scene_shift, viewer.grid.position(n_layers - 1 - i, n_layers)
+        )
+        for i in range(n_layers)
+    ]
+    assert_allclose(_find_grid_offsets(viewer), expected)
+
+
+def test_overlap_counts():
+    y_offsets = [0, 10, 0, 0, 10, 5]
+    x_offsets = [0, 0, 0, 20, 0, 5]
+    counts = _overlap_counts(y_offsets, x_offsets)
+    assert_array_equal(counts, [0, 0, 1, 0, 1, 0])
@@ -1,7 +1,6 @@
 import tempfile
 from pathlib import Path
 
-import numpy as np
 import pytest
 from qtpy import QtCore
 
@@ -10,42 +9,47 @@ from napari_timestamper._widget import (
     LayertoRGBWidget,
     RenderRGBWidget,
     TimestampWidget,
+    _color_icon,
 )
 
 
 @pytest.fixture
-def timestamp_options(make_napari_viewer, qtbot):
-    viewer = make_napari_viewer()
+def timestamp_options(viewer, qtbot):
     widget = TimestampWidget(viewer)
     viewer.window.add_dock_widget(widget)
     return widget
 
 
 @pytest.fixture
-def layer_annotations_widget(make_napari_viewer, qtbot):
-    viewer = make_napari_viewer()
+def layer_annotations_widget(viewer, qtbot):
     widget = LayerAnnotationsWidget(viewer)
     viewer.window.add_dock_widget(widget)
     return widget
 
 
 @pytest.fixture
-def render_rgb_widget(make_napari_viewer, qtbot):
-    viewer = make_napari_viewer()
+def render_rgb_widget(viewer, qtbot):
     widget = RenderRGBWidget(viewer)
     viewer.window.add_dock_widget(widget)
     return widget, viewer
 
 
 @pytest.fixture
-def layer_to_rgb_widget(make_napari_viewer, qtbot):
-    viewer = make_napari_viewer()
+def layer_to_rgb_widget(viewer, qtbot):
     widget = LayertoRGBWidget(viewer)
     qtbot.addWidget(widget)
     viewer.window.add_dock_widget(widget)
     return widget, viewer, qtbot
 
 
+def test_widgets_are_constructed(viewer, qtbot):
+    for widget_class in (TimestampWidget, LayerAnnotationsWidget):
+        widget = widget_class(viewer)
+        qtbot.addWidget(widget)
+        assert not widget._update_timer.isActive()
+        assert widget._pending_options == {}
+
+
 def test_initial_values(timestamp_options):
     assert timestamp_options.time_axis.value() == 0
     assert timestamp_options.start_time.value() == 0
@@ -66,6 +70,23 @@ def test_set_color(timestamp_options, qtbot):
     assert timestamp_options.chosen_color != "white"
 
 
+def test_color_icons_are_cached(timestamp_options):
+    update_icon = timestamp_options._update_color_button_icon
+    update_icon(timestamp_options.color, "red")
+    hits = _color_icon.cache_info().hits
+    update_icon(timestamp_options.bgcolor, "red")
+    assert _color_icon.cache_info().hits == hits + 1
+
+
+def test_color_dialog_is_reused(timestamp_options, qtbot):
+    qtbot.mouseClick(timestamp_options.color, QtCore.Qt.LeftButton)
+    dialog = timestamp_options.color_dialog
+    dialog.done(0)
+    timestamp_options._open_outline_color_dialog()
+    assert timestamp_options.color_dialog is dialog
+    dialog.done(0)
+
+
 def test_set_timestamp_overlay_options(timestamp_options):
     timestamp_options.time_axis.setValue(1)
     timestamp_options.start_time.setValue(10)
@@ -78,7 +99,7 @@ def test_set_timestamp_overlay_options(timestamp_options):
     timestamp_options.y_shift.setValue(-5)
     timestamp_options.time_format.setCurrentIndex(1)
 
-    timestamp_options._set_timestamp_overlay_options()
+    timestamp_options._set_overlay_options()
 
     assert timestamp_options.viewer._overlays["timestamp"].time_axis == 1
     assert timestamp_options.viewer._overlays["timestamp"].start_time == 10
@@ -97,6 +118,33 @@ def test_set_timestamp_overlay_options(timestamp_options):
     )
 
 
+def test_overlay_updates_are_throttled(timestamp_options, qtbot):
+    overlay = timestamp_options.viewer._overlays["timestamp"]
+    for value in range(1, 6):
+        timestamp_options.start_time.setValue(value)
+    assert overlay.start_time == 0
+    qtbot.waitUntil(lambda: overlay.start_time == 5)
+
+
+def test_hidden_overlay_is_updated_when_shown(timestamp_options, qtbot):
+    overlay = timestamp_options.viewer._overlays["timestamp"]
+    timestamp_options._toggle_overlay()
+    assert not overlay.visible
+    timestamp_options.start_time.setValue(7)
+    qtbot.wait(50)
+    assert overlay.start_time == 0
+    timestamp_options._toggle_overlay()
+    assert overlay.visible
+    assert overlay.start_time == 7
+
+
+def test_close_writes_pending_options(timestamp_options):
+    overlay = timestamp_options.viewer._overlays["timestamp"]
+    timestamp_options.start_time.setValue(3)
+    timestamp_options.close()
+    assert overlay.start_time == 3
+
+
 def test_init(layer_annotations_widget):
     widget = layer_annotations_widget
     assert widget.size_slider.value() == 12
@@ -113,7 +161,7 @@ def test_on_size_slider_change(layer_annotations_widget, qtbot):
     assert widget.layer_annotator_overlay.size == initial_value
     widget.size_slider.setValue(15)
     assert widget.size_slider.value() == 15
-    assert widget.layer_annotator_overlay.size == 15
+    qtbot.waitUntil(lambda: widget.layer_annotator_overlay.size == 15)
 
 
 def test_on_x_offset_change(layer_annotations_widget, qtbot):
@@ -122,7 +170,7 @@ def test_on_x_offset_change(layer_annotations_widget, qtbot):
     assert widget.layer_annotator_overlay.x_spacer == initial_value
     widget.x_offset_spinbox.setValue(10)
     assert widget.x_offset_spinbox.value() == 10
-    assert widget.layer_annotator_overlay.x_spacer == 10
+    qtbot.waitUntil(lambda: widget.layer_annotator_overlay.x_spacer == 10)
 
 
 def test_on_y_offset_change(layer_annotations_widget, qtbot):
@@ -131,7 +179,7 @@ def test_on_y_offset_change(layer_annotations_widget, qtbot):
     assert widget.layer_annotator_overlay.y_spacer == initial_value
     widget.y_offset_spinbox.setValue(20)
     assert widget.y_offset_spinbox.value() == 20
-    assert widget.layer_annotator_overlay.y_spacer == 20
+    qtbot.waitUntil(lambda: widget.layer_annotator_overlay.y_spacer == 20)
 
 
 def test_on_toggle_visibility(layer_annotations_widget, qtbot):
@@ -143,9 +191,9 @@ def test_on_toggle_visibility(layer_annotations_widget, qtbot):
     assert widget.layer_annotator_overlay.visible is not initial_value
 
 
-def test_layer_to_rgb_widget(render_rgb_widget):
+def test_layer_to_rgb_widget(render_rgb_widget, small_cube):
     widget, viewer = render_rgb_widget
-    viewer.add_image(np.random.random((10, 10, 10)))
+    viewer.add_image(small_cube)
     # create a temporary directory
     with tempfile.TemporaryDirectory() as tmpdirname:
         widget.directory = Path(tmpdirname)
@@ -165,9 +213,9 @@ def test_layer_to_rgb_widget(render_rgb_widget):
         )
 
 
-def test_layer_to_rgb_widget_single(render_rgb_widget):
+def test_layer_to_rgb_widget_single(render_rgb_widget, small_cube):
     widget, viewer = render_rgb_widget
-    viewer.add_image(np.random.random((10, 10, 10)))
+    viewer.add_image(small_cube)
     # create a temporary directory
     with tempfile.TemporaryDirectory() as tmpdirname:
         widget.directory = Path(tmpdirname)
@@ -178,9 +226,9 @@ def test_layer_to_rgb_widget_single(render_rgb_widget):
         assert len(list(widget.directory.glob("*.png"))) == 1
 
 
-def test_convert_layer_to_rgb(layer_to_rgb_widget):
+def test_convert_layer_to_rgb(layer_to_rgb_widget, big_cube):
     widget, viewer, qtbot = layer_to_rgb_widget
-    viewer.add_image(np.random.random((10, 800, 800)))
+    viewer.add_image(big_cube)
     for i in range(widget.layer_selector.count()):
         widget.layer_selector.item(i).setCheckState(QtCore.Qt.Checked)
 
@@ -188,3 +236,14 @@ def test_convert_layer_to_rgb(layer_to_rgb_widget):
         widget.render_button.click()
     assert viewer.layers[1].name == widget.name_lineedit.text()
     assert viewer.layers[1].data.shape == (10, 800, 800, 4)
+
+
+def test_unselected_layers_are_not_rendered(layer_to_rgb_widget, small_cube):
+    widget, viewer, _ = layer_to_rgb_widget
+    first = viewer.add_image(small_cube, name="first")
+    plane = viewer.add_image(small_cube[0], name="plane")
+    last = viewer.add_image(small_cube, name="last")
+    rendered_image = widget.render_layers_as_rgb([plane])
+    # the unselected stacks don't add a time axis to the rendering
+    assert rendered_image.ndim == 3
+    assert list(viewer.layers) == [first, plane, last]
@@ -11,9 +11,10 @@ It inherits from the ViewerOverlayMixin and VispyCanvasOverlay classes.
 This structure is adapted from the napari dev example.
 """
 import contextlib
-import warnings
+import functools
 from typing import Union
 
+import numpy as np
 from napari._vispy.overlays.base import (
     ViewerOverlayMixin,
     VispySceneOverlay,
@@ -22,6 +23,7 @@ from napari.components._viewer_constants import CanvasPosition
 from napari.components.overlays import SceneOverlay
 from napari.utils.color import ColorValue
 from napari.utils.events import disconnect_events
+from qtpy.QtCore import QTimer
 from vispy.color import ColorArray
 from vispy.visuals.transforms import STTransform
 
@@ -29,6 +31,134 @@ from napari_timestamper.text_visual import TextWithBoxVisual
 from napari_timestamper.utils import _find_grid_offsets
 
 
+# str.format callables for each time format, formatting the integer hours
+# `h`, minutes `m`, seconds `s` and centiseconds `cs` of the timestamp or
+# the total time `t`
+_TIMESTAMP_FORMATTERS = {
+    "HH:MM:SS": "{h:02}:{m:02}:{s:02}".format,
+    "HH:MM:SS.ss": "{h:02}:{m:02}:{s:02}.{cs:02}".format,
+    "HH:MM": "{h:02}:{m:02}".format,
+    "H:M:S": "{h}:{m}:{s}".format,
+    "H:M": "{h}:{m}".format,
+    "H:M:S.ss": "{h}:{m}:{s}.{cs:02}".format,
+    "MM:SS": "{m:02}:{s:02}".format,
+    "MM:SS.ss": "{m:02}:{s:02}.{cs:02}".format,
+    "M:S": "{m}:{s}".format,
+    "M:S.ss": "{m}:{s}.{cs:02}".format,
+    "SS": "{t:02.0f}".format,
+    "SS.ss": "{t:05.2f}".format,
+    "F": "{t:.0f}".format,
+}
+# allowed format specifiers, in the order they are offered in the widget
+_ALLOWED_FORMAT_SPECIFIERS = tuple(_TIMESTAMP_FORMATTERS)
+# formats that only need the total time `t`
+_TOTAL_TIME_FORMATS = frozenset(("SS", "SS.ss", "F"))
+# formats that show centiseconds, all others round to whole seconds
+_CENTISECOND_FORMATS = frozenset(
+    ("HH:MM:SS.ss", "H:M:S.ss", "MM:SS.ss", "M:S.ss")
+)
+
+# anchors and translation (from the maximum x and y, the x and y size and
+# the x and y spacer) of each canvas position
+_POSITION_LAYOUTS = {
+    CanvasPosition.TOP_LEFT: (
+        ("left", "bottom"),
+        lambda xm, ym, xs, ys, xsp, ysp: [xsp - 0.5, ysp - 0.5, 0, 0],
+    ),
+    CanvasPosition.TOP_RIGHT: (
+        ("right", "bottom"),
+        lambda xm, ym, xs, ys, xsp, ysp: [
+            xm - xs - xsp - 0.5,
+            ysp - 0.5,
+            0,
+            0,
+        ],
+    ),
+    CanvasPosition.TOP_CENTER: (
+        ("center", "bottom"),
+        lambda xm, ym, xs, ys, xsp, ysp: [
+            xm / 2 - xs / 2 - 0.5,
+            ysp - 0.5,
+            0,
+            0,
+        ],
+    ),
+    CanvasPosition.BOTTOM_RIGHT: (
+        ("right", "top"),
+        lambda xm, ym, xs, ys, xsp, ysp: [
+            xm - xs - xsp - 0.5,
+            ym - ys - ysp - 0.5,
+            0,
+            0,
+        ],
+    ),
+    CanvasPosition.BOTTOM_LEFT: (
+        ("left", "top"),
+        lambda xm, ym, xs, ys, xsp, ysp: [
+            xsp - 0.5,
+            ym - ys - ysp - 0.5,
+            0,
+            0,
+        ],
+    ),
+    CanvasPosition.BOTTOM_CENTER: (
+        ("center", "top"),
+        lambda xm, ym, xs, ys, xsp, ysp: [
+            xm / 2 - xs / 2 - 0.5,
+            ym - ys - ysp - 0.5,
+            0,
+            0,
+        ],
+    ),
+}
+
+# pending updates of VispyTimestampOverlay, see _schedule and _flush
+_DIRTY_POS = 1
+_DIRTY_SIZE = 2
+_DIRTY_TEXT = 4
+_DIRTY_COLOR = 8
+
+
+@functools.lru_cache(maxsize=256)
+def _format_timestamp_cached(start_time, time, step_size, format_specifier):
+    """
+    Formats the timestamp of frame `time`, memoized on all its inputs.
+
+    Parameters
+    ----------
+    start_time : int
+        The time of the first frame.
+    time : int
+        The current frame.
+    step_size : float
+        The time between two frames.
+    format_specifier : str
+        The format specifier for the timestamp text.
+
+    Returns
+    -------
+    str
+        The formatted timestamp string.
+    """
+    try:
+        formatter = _TIMESTAMP_FORMATTERS[format_specifier]
+    except KeyError as e:
+        raise ValueError(
+            f"Unknown format specifier: {format_specifier}"
+        ) from e
+    if format_specifier in _TOTAL_TIME_FORMATS:
+        return formatter(t=time)
+
+    # split the time rounded to whole units with integer arithmetic, which
+    # is exact and carries e.g. 59.999 s over to the next minute
+    unit = 100 if format_specifier in _CENTISECOND_FORMATS else 1
+    total_units = round((start_time + time * step_size) * unit)
+    hours, rest = divmod(total_units, 3600 * unit)
+    minutes, rest = divmod(rest, 60 * unit)
+    seconds, centiseconds = divmod(rest, unit)
+    return formatter(h=hours, m=minutes, s=seconds, cs=centiseconds)
+
+
 class TimestampOverlay(SceneOverlay):
     """
     Timestamp Overlay.
@@ -55,6 +185,10 @@ class TimestampOverlay(SceneOverlay):
     position: CanvasPosition = CanvasPosition.BOTTOM_RIGHT
     scale_with_zoom: bool = True
     display_on_scene: bool = True
+    # (inputs, string) of the last formatted timestamp and (settings,
+    # {time: string}) of precomputed timestamps, private attributes
+    _timestamp_cache: tuple = (None, "")
+    _precomputed_timestamps: tuple = (None, {})
 
     def _timestamp_string(self):
         """
@@ -65,9 +199,111 @@ class TimestampOverlay(SceneOverlay):
         str
             The formatted timestamp string.
         """
+        settings = self._timestamp_settings()
+        key = (self.time, *settings)
+        cached_key, cached_string = self._timestamp_cache
+        if key == cached_key:
+            return cached_string
+        precomputed_settings, precomputed = self._precomputed_timestamps
+        if settings == precomputed_settings and self.time in precomputed:
+            return precomputed[self.time]
+
         timestamp = self._format_timestamp(self.time, self.time_format)
         suffix = self.custom_suffix if self.custom_suffix else self.time_format
-        return f"{self.prefix} {timestamp} {suffix}"
+        timestamp_string = f"{self.prefix} {timestamp} {suffix}"
+        self._timestamp_cache = (key, timestamp_string)
+        return timestamp_string
+
+    def _timestamp_settings(self):
+        """
+        Returns the settings, apart from the time, the timestamp string
+        depends on.
+        """
+        return (
+            self.time_format,
+            self.prefix,
+            self.custom_suffix,
+            self.start_time,
+            self.step_size,
+        )
+
+    @classmethod
+    def precompute_strings(
+        cls,
+        n_frames,
+        start_time=0,
+        step_size=1,
+        time_format="MM:SS",
+        prefix="",
+        custom_suffix=None,
+    ):
+        """
+        Returns the timestamp strings of the frames 0 to n_frames - 1.
+
+        Parameters
+        ----------
+        n_frames : int
+            The number of frames.
+        start_time : int, optional
+            The time of the first frame, by default 0.
+        step_size : float, optional
+            The time between two frames, by default 1.
+        time_format : str, optional
+            The format specifier for the timestamp text, by default "MM:SS".
+        prefix : str, optional
+            The prefix of the timestamp, by default "".
+        custom_suffix : str, optional
+            The suffix of the timestamp, by default the time format.
+
+        Returns
+        -------
+        list of str
+            The timestamp string of each frame.
+        """
+        try:
+            formatter = _TIMESTAMP_FORMATTERS[time_format]
+        except KeyError as e:
+            raise ValueError(f"Unknown format specifier: {time_format}") from e
+        suffix = custom_suffix if custom_suffix else time_format
+        frames = np.arange(n_frames)
+        unit = 100 if time_format in _CENTISECOND_FORMATS else 1
+        total_units = np.rint((start_time + frames * step_size) * unit)
+        hours, rest = np.divmod(total_units.astype(np.int64), 3600 * unit)
+        minutes, rest = np.divmod(rest, 60 * unit)
+        seconds, centiseconds = np.divmod(rest, unit)
+        return [
+            f"{prefix} {formatter(h=h, m=m, s=s, cs=cs, t=t)} {suffix}"
+            for h, m, s, cs, t in zip(
+                hours.tolist(),
+                minutes.tolist(),
+                seconds.tolist(),
+                centiseconds.tolist(),
+                frames.tolist(),
+            )
+        ]
+
+    def precompute_timestamps(self, n_frames):
+        """
+        Precomputes the timestamp strings of the frames 0 to n_frames - 1
+        with the current settings, e.g. before rendering a timelapse.
+
+        Parameters
+        ----------
+        n_frames : int
+            The number of frames.
+        """
+        strings = self.precompute_strings(
+            n_frames,
+            start_time=self.start_time,
+            step_size=self.step_size,
+            time_format=self.time_format,
+            prefix=self.prefix,
+            custom_suffix=self.custom_suffix,
+        )
+        self._precomputed_timestamps = (
+            self._timestamp_settings(),
+            dict(enumerate(strings)),
+        )
 
     def _format_timestamp(self, total_time, format_specifier):
         """
@@ -85,64 +321,21 @@ class TimestampOverlay(SceneOverlay):
         str
             The formatted timestamp string.
         """
-        time = float(self.start_time + self.time * self.step_size)
-        hours = int(time // 3600)
-        minutes = int((time % 3600) // 60)
-        seconds = time % 60
-
-        if format_specifier == "HH:MM:SS":
-            return f"{hours:02}:{minutes:02}:{seconds:02.0f}"
-        if format_specifier == "HH:MM:SS.ss":
-            return f"{hours:02}:{minutes:02}:{seconds:05.2f}"
-        elif format_specifier == "HH:MM":
-            return f"{hours:02}:{minutes:02}"
-        elif format_specifier == "H:M:S":
-            return f"{hours}:{minutes}:{seconds:.0f}"
-        elif format_specifier == "H:M":
-            return f"{hours}:{minutes}"
-        elif format_specifier == "H:M:S.ss":
-            return f"{hours}:{minutes}:{seconds:.2f}"
-        elif format_specifier == "MM:SS":
-            return f"{minutes:02}:{seconds:02.0f}"
-        elif format_specifier == "MM:SS.ss":
-            return f"{minutes:02}:{seconds:05.2f}"
-        elif format_specifier == "M:S":
-            return f"{minutes}:{seconds:.0f}"
-        elif format_specifier == "M:S.ss":
-            return f"{minutes}:{seconds:.2f}"
-        elif format_specifier == "SS":
-            return f"{total_time:02.0f}"
-        elif format_specifier == "SS.ss":
-            return f"{total_time:05.2f}"
-        elif format_specifier == "F":
-            return f"{total_time:.0f}"
-        else:
-            raise ValueError(f"Unknown format specifier: {format_specifier}")
+        return _format_timestamp_cached(
+            self.start_time, total_time, self.step_size, format_specifier
+        )
 
+    @staticmethod
     def _get_allowed_format_specifiers():
         """
-        Returns a list of allowed format specifiers.
+        Returns the allowed format specifiers.
 
         Returns
         -------
-        list of str
-            A list of allowed format specifiers.
+        tuple of str
+            The allowed format specifiers.
         """
-        return [
-            "HH:MM:SS",
-            "HH:MM:SS.ss",
-            "HH:MM",
-            "H:M:S",
-            "H:M",
-            "H:M:S.ss",
-            "MM:SS",
-            "MM:SS.ss",
-            "M:S",
-            "M:S.ss",
-            "SS",
-            "SS.ss",
-            "F",
-        ]
+        return _ALLOWED_FORMAT_SPECIFIERS
 
     @property
     def text(self):
@@ -180,43 +373,167 @@ class VispyTimestampOverlay(ViewerOverlayMixin, VispySceneOverlay):
         self.y_size = 0
         self.camera_scaling_factor = 1
         self.node.transform = STTransform()
-        self.overlay.events.position.connect(self._on_position_change)
+        # values last set on the visual by _set_node_property
+        self._node_properties = {}
+        # largest (y, x) grid offset of the layers, invalidated by the layer,
+        # grid and dims range events, see _max_grid_offset
+        self._grid_offset_max = None
+        # (x, y) size of the scene, invalidated by the dims range event
+        self._dims_range_xy = None
+        # whether the camera zoom is connected, see _connect_zoom
+        self._zoom_connected = False
+        # derived overlay properties, refreshed by the events that change them
+        self._bg_rgba = self.overlay.bg_color.rgba.tolist()
+        self._outline_rgba = self.overlay.outline_color.rgba.tolist()
+
+        # bursts of events are coalesced into a single update per event
+        # loop tick, see _schedule and _flush
+        self._dirty = 0
+        self._batching = False
+        # set once reset() has run the initial update
+        self._initialized = False
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self._flush)
 
         # setup callbacks
-        self.overlay.events.color.connect(self._on_color_change)
-        self.overlay.events.size.connect(self._on_size_change)
-        self.overlay.events.bold.connect(self._on_text_change)
-        self.overlay.events.italic.connect(self._on_text_change)
-        self.overlay.events.bg_color.connect(self._on_text_change)
-        self.overlay.events.show_background.connect(self._on_text_change)
-        self.overlay.events.show_outline.connect(self._on_text_change)
-        self.overlay.events.outline_color.connect(self._on_text_change)
-        self.overlay.events.outline_thickness.connect(self._on_text_change)
-
-        self.overlay.events.text.connect(self._on_text_change)
+        self.overlay.events.position.connect(self._schedule_position)
+        self.overlay.events.color.connect(self._schedule_color)
+        self.overlay.events.size.connect(self._schedule_size)
+        self.overlay.events.bold.connect(self._schedule_text)
+        self.overlay.events.italic.connect(self._schedule_text)
+        self.overlay.events.bg_color.connect(self._on_bg_color_change)
+        self.overlay.events.show_background.connect(self._schedule_text)
+        self.overlay.events.show_outline.connect(self._schedule_text)
+        self.overlay.events.outline_color.connect(
+            self._on_outline_color_change
+        )
+        self.overlay.events.outline_thickness.connect(self._schedule_text)
+
+        self.overlay.events.text.connect(self._schedule_text)
         self.overlay.events.y_spacer.connect(self._update_offsets)
         self.overlay.events.x_spacer.connect(self._update_offsets)
-        self.overlay.events.time_format.connect(self._on_text_change)
-        self.overlay.events.start_time.connect(self._on_time_change)
-        self.overlay.events.step_size.connect(self._on_time_change)
-        self.overlay.events.prefix.connect(self._on_text_change)
-        self.overlay.events.custom_suffix.connect(self._on_text_change)
-        self.overlay.events.time_axis.connect(self._on_text_change)
-        self.overlay.events.scale_with_zoom.connect(self._on_size_change)
-        self.overlay.events.display_on_scene.connect(self._on_position_change)
+        self.overlay.events.time_format.connect(self._schedule_text)
+        self.overlay.events.start_time.connect(self._schedule_text)
+        self.overlay.events.step_size.connect(self._schedule_text)
+        self.overlay.events.prefix.connect(self._schedule_text)
+        self.overlay.events.custom_suffix.connect(self._schedule_text)
+        self.overlay.events.time_axis.connect(self._schedule_text)
+        self.overlay.events.scale_with_zoom.connect(self._schedule_size)
+        self.overlay.events.display_on_scene.connect(self._schedule_position)
+        # the time is updated right away, so that rendering a timelapse
+        # never captures a stale timestamp
         self.viewer.dims.events.current_step.connect(self._on_time_change)
-        self.viewer.camera.events.zoom.connect(self._on_viewer_zoom_change)
-        self.viewer.dims.events.ndisplay.connect(self._on_text_change)
+        self._connect_zoom(True)
+        self.viewer.dims.events.ndisplay.connect(self._schedule_text)
+        self.viewer.dims.events.range.connect(self._on_dims_range_change)
+        self.viewer.grid.events.connect(self._on_grid_change)
+        self.viewer.layers.events.inserted.connect(self._on_grid_change)
+        self.viewer.layers.events.removed.connect(self._on_grid_change)
+        self.viewer.layers.events.reordered.connect(self._on_grid_change)
         self.node.events.parent_change.connect(self._on_parent_change)
         self.reset()
 
+    def close(self):
+        """
+        Disconnects the viewer events connected in __init__, the base class
+        only disconnects the overlay events.
+        """
+        self._flush_timer.stop()
+        self._connect_zoom(False)
+        self.viewer.dims.events.current_step.disconnect(self._on_time_change)
+        self.viewer.dims.events.ndisplay.disconnect(self._schedule_text)
+        self.viewer.dims.events.range.disconnect(self._on_dims_range_change)
+        self.viewer.grid.events.disconnect(self._on_grid_change)
+        self.viewer.layers.events.inserted.disconnect(self._on_grid_change)
+        self.viewer.layers.events.removed.disconnect(self._on_grid_change)
+        self.viewer.layers.events.reordered.disconnect(self._on_grid_change)
+        super().close()
+
+    def _schedule(self, flags):
+        """
+        Marks `flags` as dirty and schedules a flush on the next event loop
+        tick, so that a burst of events results in a single update.
+        """
+        self._dirty |= flags
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _schedule_text(self, event=None):
+        self._schedule(_DIRTY_TEXT)
+
+    def _schedule_color(self, event=None):
+        self._schedule(_DIRTY_COLOR)
+
+    def _schedule_size(self, event=None):
+        self._schedule(_DIRTY_SIZE)
+
+    def _schedule_position(self, event=None):
+        self._schedule(_DIRTY_POS)
+
+    def _flush(self):
+        """
+        Runs the pending updates once, in dependency order.
+        """
+        self._flush_timer.stop()
+        dirty, self._dirty = self._dirty, 0
+        if dirty & _DIRTY_TEXT:
+            self._on_text_change()
+        if dirty & _DIRTY_COLOR:
+            self._on_color_change()
+        # the size update cascades into the position update
+        if dirty & _DIRTY_SIZE:
+            self._on_size_change()
+        elif dirty & _DIRTY_POS:
+            self._on_position_change()
+
+    def _on_bg_color_change(self, event=None):
+        """
+        Callback function for when the background color is changed.
+        """
+        self._bg_rgba = self.overlay.bg_color.rgba.tolist()
+        self._schedule_text()
+
+    def _on_outline_color_change(self, event=None):
+        """
+        Callback function for when the outline color is changed.
+        """
+        self._outline_rgba = self.overlay.outline_color.rgba.tolist()
+        self._schedule_text()
+
     def _update_offsets(self, event=None):
         """
         Callback function for when the offsets of the overlay are changed.
         """
         self.x_spacer = self.overlay.x_spacer
         self.y_spacer = self.overlay.y_spacer
-        self._on_position_change()
+        self._schedule_position()
+
+    def _on_grid_change(self, event=None):
+        """
+        Callback function for when the grid offsets of the layers change.
+        """
+        self._grid_offset_max = None
+        self._schedule_position()
+
+    def _on_dims_range_change(self, event=None):
+        """
+        Callback function for when the range of the dims is changed.
+        """
+        self._dims_range_xy = None
+        self._on_grid_change()
+
+    def _max_grid_offset(self):
+        """
+        Returns the largest (y, x) grid offset of the layers.
+        """
+        if self._grid_offset_max is None:
+            offsets = _find_grid_offsets(self.viewer)
+            self._grid_offset_max = (
+                offsets.max(axis=0).tolist() if len(offsets) else [0, 0]
+            )
+        return self._grid_offset_max
 
     def _on_parent_change(self, event):
         if event.old is not None:
@@ -225,9 +542,14 @@ class VispyTimestampOverlay(ViewerOverlayMixin, VispySceneOverlay):
 
         if event.new is not None and self.node.canvas is not None:
             # connect the canvas resize to recalculating the position
-            event.new.canvas.events.resize.connect(self._on_position_change)
+            event.new.canvas.events.resize.connect(self._schedule_position)
 
-        self._on_viewer_zoom_change()
+        # reset() updates the size and text itself
+        if not self._initialized:
+            return
+        # the size update depends on the parent, so it runs right away
+        self.camera_scaling_factor = self.viewer.camera.zoom
+        self._on_size_change()
         self._on_text_change()
 
     def _on_viewer_zoom_change(self, event=None):
@@ -235,154 +557,138 @@ class VispyTimestampOverlay(ViewerOverlayMixin, VispySceneOverlay):
         Callback function for when the viewer is zoomed.
         """
         self.camera_scaling_factor = self.viewer.camera.zoom
-        self._on_size_change()
+        self._schedule_size()
+
+    def _connect_zoom(self, connect):
+        """
+        Connects or disconnects the camera zoom, which does not affect a
+        fixed size overlay on the canvas.
+        """
+        if connect == self._zoom_connected:
+            return
+        self._zoom_connected = connect
+        if connect:
+            self.camera_scaling_factor = self.viewer.camera.zoom
+            self.viewer.camera.events.zoom.connect(self._on_viewer_zoom_change)
+        else:
+            self.viewer.camera.events.zoom.disconnect(
+                self._on_viewer_zoom_change
+            )
 
     def _on_color_change(self, event=None):
         """
         Callback function for when the color of the overlay is changed.
         """
-        self.node.color = self.overlay.color
+        self._set_node_property("color", tuple(self.overlay.color))
 
     def _on_position_change(self, event=None):
         """
         Callback function for when the position of the overlay is changed.
         """
-        # filter FutureWarnings from napari
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            position = self.overlay.position
-            if self.node.canvas is None:
-                return
-
-            if not self.overlay.display_on_scene:
-                x_max, y_max = list(self.node.canvas.size)
-                self.node.parent = (
-                    self.viewer.window.qt_viewer.view
-                )  # this is a bit ugly and circumvents the overlay system which is not ideal but it works
-            else:
-                x_max, y_max = (
-                    self.viewer.dims.range[-2][-2] + 1,
-                    self.viewer.dims.range[-1][-2] + 1,
+        position = self.overlay.position
+        if self.node.canvas is None:
+            return
+
+        self._update_parent()
+        if not self.overlay.display_on_scene:
+            x_max, y_max = self.node.canvas.size
+        else:
+            if self._dims_range_xy is None:
+                dims_range = self.viewer.dims.range
+                self._dims_range_xy = (
+                    dims_range[-2][-2] + 1,
+                    dims_range[-1][-2] + 1,
                 )
-                if self.viewer.grid.enabled:
-                    layer_translations = _find_grid_offsets(self.viewer)
-                    # find maximum x and y translation
-                    x_max_offset = max(
-                        [translation[-1] for translation in layer_translations]
-                    )
-                    y_max_offset = max(
-                        [translation[-2] for translation in layer_translations]
-                    )
-                    x_max += x_max_offset
-                    y_max += y_max_offset
-
-                self.node.parent = (
-                    self.viewer.window.qt_viewer.view.scene
-                )  # this is a bit ugly and circumvents the overlay system which is not ideal but it works
-
-        if position == CanvasPosition.TOP_LEFT:
-            anchors = ("left", "bottom")
-            transform = [self.x_spacer - 0.5, self.y_spacer - 0.5, 0, 0]
-
-        elif position == CanvasPosition.TOP_RIGHT:
-            anchors = ("right", "bottom")
-            transform = [
-                x_max - self.x_size - self.x_spacer - 0.5,
-                self.y_spacer - 0.5,
-                0,
-                0,
-            ]
-        elif position == CanvasPosition.TOP_CENTER:
-            transform = [
-                x_max / 2 - self.x_size / 2 - 0.5,
-                self.y_spacer - 0.5,
-                0,
-                0,
-            ]
-            anchors = ("center", "bottom")
-
-        elif position == CanvasPosition.BOTTOM_RIGHT:
-            anchors = ("right", "top")
-            transform = [
-                x_max - self.x_size - self.x_spacer - 0.5,
-                y_max - self.y_size - self.y_spacer - 0.5,
-                0,
-                0,
-            ]
-        elif position == CanvasPosition.BOTTOM_LEFT:
-            anchors = ("left", "top")
-            transform = [
-                self.x_spacer - 0.5,
-                y_max - self.y_size - self.y_spacer - 0.5,
-                0,
-                0,
-            ]
-        elif position == CanvasPosition.BOTTOM_CENTER:
-            anchors = ("center", "top")
-            transform = [
-                x_max / 2 - self.x_size / 2 - 0.5,
-                y_max - self.y_size - self.y_spacer - 0.5,
-                0,
-                0,
-            ]
-        self.node.transform.translate = transform
-        self.node.anchors = anchors
+            x_max, y_max = self._dims_range_xy
+            if self.viewer.grid.enabled:
+                # find maximum x and y translation
+                y_max_offset, x_max_offset = self._max_grid_offset()
+                x_max += x_max_offset
+                y_max += y_max_offset
+
+        anchors, get_translation = _POSITION_LAYOUTS[
+            CanvasPosition(position)
+        ]
+        transform = get_translation(
+            x_max,
+            y_max,
+            self.x_size,
+            self.y_size,
+            self.x_spacer,
+            self.y_spacer,
+        )
+        # the anchors setter rebuilds the box, so only set what changed
+        self._set_node_property("anchors", anchors)
+        if self._node_properties.get("translate") != transform:
+            self._node_properties["translate"] = transform
+            self.node.transform.translate = transform
         self.node._rectagles_visual.spacer = self.overlay.x_spacer
 
-        self.node.update_data(
-            [self.overlay.text],
-            [self.overlay.color],
-            self.overlay.bg_color.rgba.tolist(),
-            self.overlay.size,
-            (0, 0),
-            [x_max],
-        )
+        # the text, colors and font size are kept up to date by their own
+        # callbacks, only the layout of the box depends on the position
+        self.node.update_layout((0, 0), [x_max])
+
+    def _update_parent(self):
+        """
+        Parents the visual to the scene or, if it is not displayed on the
+        scene, to the canvas.
+        """
+        if self.node.canvas is None:
+            return
+        # this is a bit ugly and circumvents the overlay system which is not
+        # ideal but it works
+        view = self.viewer.window._qt_viewer.view
+        if self.overlay.display_on_scene:
+            self.node.parent = view.scene
+        else:
+            self.node.parent = view
 
     def _on_size_change(self, event=None):
         """
         Callback function for when the size of the overlay is changed.
         """
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            if (
-                self.overlay.scale_with_zoom
-                and self.node.parent is self.viewer.window.qt_viewer.view.scene
-            ):
-                self.node.font_scale_factor = self.camera_scaling_factor
-                self.node.font_size = self.overlay.size
-                self.node.outline_thickness = self.overlay.outline_thickness
-                self.node.rectangles_scale_factor = 1
-
-            elif (
-                not self.overlay.scale_with_zoom
-                and self.node.parent is self.viewer.window.qt_viewer.view
-            ):
-                self.node.font_scale_factor = 1
-                self.node.font_size = self.overlay.size
-                self.node.outline_thickness = self.overlay.outline_thickness
-                self.node.rectangles_scale_factor = 1
-
-            elif (
-                not self.overlay.scale_with_zoom
-                and self.node.parent is self.viewer.window.qt_viewer.view.scene
-            ):
-                self.node.font_scale_factor = 1
-                self.node.rectangles_scale_factor = (
-                    1 / self.camera_scaling_factor
-                )
-                self.node.outline_thickness = self.overlay.outline_thickness
-                self.node.font_size = self.overlay.size
-
-            elif (
-                self.overlay.scale_with_zoom
-                and self.node.parent is self.viewer.window.qt_viewer.view
-            ):
-                self.node.font_scale_factor = self.camera_scaling_factor
-                self.node.rectangles_scale_factor = self.camera_scaling_factor
-                self.node.outline_thickness = self.overlay.outline_thickness
-                self.node.font_size = self.overlay.size
-
-        self._on_position_change()
+        view = self.viewer.window._qt_viewer.view
+        self._connect_zoom(
+            self.overlay.scale_with_zoom or self.node.parent is not view
+        )
+        if self.overlay.scale_with_zoom and self.node.parent is view.scene:
+            self._set_font_scale_factor(self.camera_scaling_factor)
+            self._set_node_property("font_size", self.overlay.size)
+            self.node.outline_thickness = self.overlay.outline_thickness
+            self.node.rectangles_scale_factor = 1
+
+        elif not self.overlay.scale_with_zoom and self.node.parent is view:
+            self._set_font_scale_factor(1)
+            self._set_node_property("font_size", self.overlay.size)
+            self.node.outline_thickness = self.overlay.outline_thickness
+            self.node.rectangles_scale_factor = 1
+
+        elif (
+            not self.overlay.scale_with_zoom
+            and self.node.parent is view.scene
+        ):
+            self._set_font_scale_factor(1)
+            self.node.rectangles_scale_factor = 1 / self.camera_scaling_factor
+            self.node.outline_thickness = self.overlay.outline_thickness
+            self._set_node_property("font_size", self.overlay.size)
+
+        elif self.overlay.scale_with_zoom and self.node.parent is view:
+            self._set_font_scale_factor(self.camera_scaling_factor)
+            self.node.rectangles_scale_factor = self.camera_scaling_factor
+            self.node.outline_thickness = self.overlay.outline_thickness
+            self._set_node_property("font_size", self.overlay.size)
+
+        if not self._batching:
+            self._on_position_change()
+
+    def _set_font_scale_factor(self, factor):
+        """
+        Sets the font scale factor of the visual, which the font size has to
+        be set again for.
+        """
+        if factor != self.node.font_scale_factor:
+            self.node.font_scale_factor = factor
+            self._node_properties.pop("font_size", None)
 
     def _on_text_change(self, event=None):
         """
@@ -395,29 +701,60 @@ class VispyTimestampOverlay(ViewerOverlayMixin, VispySceneOverlay):
             self.node.show_background = self.overlay.show_background
             self.node.show_outline = self.overlay.show_outline
 
-        self.node.text = self.overlay.text
+        self._set_node_property("text", self.overlay.text)
         self.node.bold = self.overlay.bold
         self.node.italic = self.overlay.italic
-        self.node.bgcolor = self.overlay.bg_color.rgba.tolist()
-        self.node.outline_color = self.overlay.outline_color.rgba.tolist()
+        self.node.bgcolor = list(self._bg_rgba)
+        self.node.outline_color = self._outline_rgba
         self.node.outline_thickness = self.overlay.outline_thickness
 
     def _on_time_change(self, event=None):
         """
         Callback function for when the time of the overlay is changed.
         """
-        self.overlay.time = self.viewer.dims.current_step[
-            self.overlay.time_axis
-        ]
-        self.node.text = self.overlay.text
+        current_step = self.viewer.dims.current_step
+        time_axis = self.overlay.time_axis
+        if time_axis >= len(current_step):
+            return
+        time = current_step[time_axis]
+        # sliders of the other axes do not change the timestamp
+        if time == self.overlay.time and "text" in self._node_properties:
+            return
+        self.overlay.time = time
+        self._set_node_property("text", self.overlay.text)
+
+    def _set_node_property(self, name, value):
+        """
+        Sets a property of the visual, unless it was already set to the same
+        value, which spares re-uploading the glyphs of an unchanged text.
+        """
+        if name in self._node_properties and (
+            self._node_properties[name] == value
+        ):
+            return
+        self._node_properties[name] = value
+        setattr(self.node, name, value)
 
     def reset(self):
         """
         Resets the overlay to its initial state.
         """
         super().reset()
-        self._on_color_change()
-        self._on_size_change()
+        # run every stage once in dependency order instead of letting the
+        # parent change and the size update cascade into the others
+        self._initialized = False
+        self._batching = True
+        try:
+            self._on_color_change()
+            self._on_text_change()
+            self._update_parent()
+            self.camera_scaling_factor = self.viewer.camera.zoom
+            self._on_size_change()
+        finally:
+            self._batching = False
         self._on_position_change()
-        self._on_text_change()
         self._on_time_change()
+        self._initialized = True
+        # everything scheduled in the meantime is up to date now
+        self._dirty = 0
+        self._flush_timer.stop()
@@ -4,11 +4,10 @@ Dock widget for napari-timestamper
 from __future__ import annotations
 
 import warnings
+from functools import lru_cache, partial
 from pathlib import Path
 
 import napari
-from napari._vispy.utils.visual import overlay_to_visual
-from napari.components._viewer_constants import CanvasPosition
 from qtpy import QtCore, QtGui, QtWidgets
 from qtpy.QtCore import Slot
 from qtpy.QtWidgets import (
@@ -24,22 +23,240 @@ from qtpy.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from superqt import QLabeledSlider
 from vispy.color import ColorArray
 
-from napari_timestamper._layer_annotator_overlay import (
-    LayerAnnotatorOverlay,
-    ScenePosition,
-    VispyLayerAnnotatorOverlay,
-)
-from napari_timestamper._timestamp_overlay import (
-    TimestampOverlay,
-    VispyTimestampOverlay,
-)
-from napari_timestamper.render_as_rgb import render_as_rgb, save_image_stack
+# the overlays, napari's vispy internals, superqt and the renderer are
+# imported where they are used, so that importing the widgets is cheap
+
+
+def _frame_interval():
+    """
+    Returns the refresh interval of the primary screen in milliseconds, which
+    the overlay updates are aligned to. Refresh rates below 30 Hz are treated
+    as 30 Hz.
+    """
+    screen = QtWidgets.QApplication.primaryScreen()
+    refresh_rate = screen.refreshRate() if screen is not None else 60
+    return int(1000 / max(refresh_rate, 30))
+
+
+def _push_options(overlay, options, last_pushed):
+    """
+    Sets the options on the overlay that changed since they were last pushed,
+    recording them in last_pushed.
+    """
+    changed = {
+        name: value
+        for name, value in options.items()
+        if name not in last_pushed
+        # cached values such as _color_array's are compared by identity
+        or (last_pushed[name] is not value and last_pushed[name] != value)
+    }
+    if not changed:
+        return
+    # EventedModel.update sets all fields under a single blocker of the
+    # events group, which is emitted once at the end
+    overlay.update(changed)
+    last_pushed.update(changed)
+
+
+@lru_cache(maxsize=256)
+def _color_array(color, alpha=None):
+    """
+    Returns the ColorArray for the color name and alpha. They are cached, as
+    dragging the opacity slider revisits the same few hundred values.
+    """
+    return ColorArray(color, alpha=alpha)
+
+
+@lru_cache(maxsize=None)
+def _enum_items(enum):
+    """
+    Returns the values of the enum as the items of a combo box, built once
+    per enum instead of on every widget construction.
+    """
+    return tuple(member.value for member in enum)
+
+
+@lru_cache(maxsize=64)
+def _color_icon(color_str):
+    """
+    Returns a 20x20 icon filled with the given color. The icons are cached,
+    as the same few colors are set on the color buttons over and over.
+    """
+    pixmap = QtGui.QPixmap(20, 20)
+    pixmap.fill(QtGui.QColor(color_str))
+    return QtGui.QIcon(pixmap)
+
+
+def _add_form_rows(widget, layout, rows):
+    """
+    Adds the rows to the form layout in order. A row is either a
+    (label_name, label, name, widget_class, options) spec, for which a QLabel
+    and an input widget are created and stored on widget as label_name and
+    name, or a tuple of a field or a label and a field built by the caller.
+    options may set the "range", "value", "text", "items" and current
+    "index" of the input.
+    """
+    for row in rows:
+        if len(row) < 5:
+            layout.addRow(*row)
+            continue
+        label_name, label, name, widget_class, options = row
+        label_widget = QtWidgets.QLabel(label)
+        input_widget = widget_class()
+        if "range" in options:
+            input_widget.setRange(*options["range"])
+        if "items" in options:
+            input_widget.addItems(options["items"])
+        if "index" in options:
+            input_widget.setCurrentIndex(options["index"])
+        if "value" in options:
+            input_widget.setValue(options["value"])
+        if "text" in options:
+            input_widget.setText(options["text"])
+        setattr(widget, label_name, label_widget)
+        setattr(widget, name, input_widget)
+        layout.addRow(label_widget, input_widget)
+
+
+class _OverlayOptionsMixin:
+    """
+    What the overlay option widgets share: writing the options changed by
+    the widgets to the overlay at most once per frame, and the color buttons
+    with the color dialog shared by them. Expects the widget to provide the
+    _overlay and its _overlay_options read from the widgets, the color,
+    bgcolor, outline_color and opacity_slider widgets and the chosen_*
+    colors, and to call _setup_overlay_updates before connecting them.
+    """
+
+    overlay_set: bool = False
+
+    def _setup_overlay_updates(self):
+        self.color_dialog = None
+        # options last written to the overlay, see _push_options, and the
+        # options changed by the widgets since
+        self._last_pushed = {}
+        self._pending_options = {}
+        self._full_update_pending = False
+        # bursts of widget changes are written to the overlay at most once
+        # per frame, see _schedule_option
+        self._update_timer = QtCore.QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(_frame_interval())
+        self._update_timer.timeout.connect(self._flush_overlay_update)
+
+    def _schedule_option(self, name, value):
+        """
+        Schedules writing a single option, as sent by the signal of its
+        widget, without reading the other widgets.
+        """
+        self._pending_options[name] = value
+        # the running timer isn't restarted, so that a continuous drag is
+        # still written once per frame instead of once it stops
+        if not self._update_timer.isActive():
+            self._update_timer.start()
+
+    def _schedule_checkbox_option(self, name, checkbox, state=None):
+        self._schedule_option(name, checkbox.isChecked())
+
+    def _schedule_opacity(self, value):
+        self._schedule_option(
+            "bg_color", _color_array(self.chosen_bgcolor, alpha=value / 100)
+        )
+
+    def _flush_overlay_update(self):
+        """
+        Writes the scheduled options to the overlay. While the overlay is
+        hidden they are kept until it is shown again.
+        """
+        if self.overlay_set and not self._overlay.visible:
+            return
+        if self._full_update_pending:
+            self._set_overlay_options()
+            return
+        options, self._pending_options = self._pending_options, {}
+        if self.overlay_set:
+            _push_options(self._overlay, options, self._last_pushed)
+
+    def _set_overlay_options(self):
+        """
+        Writes all options, as read from the widgets, to the overlay. While
+        the overlay is hidden they are written once it is shown again.
+        """
+        if self.overlay_set and not self._overlay.visible:
+            self._full_update_pending = True
+            return
+        # every option is read from the widgets, so nothing is pending
+        self._update_timer.stop()
+        self._full_update_pending = False
+        self._pending_options = {}
+        if self.overlay_set:
+            _push_options(
+                self._overlay, self._overlay_options(), self._last_pushed
+            )
+
+    def closeEvent(self, event):
+        # write the options scheduled just before closing instead of
+        # leaving them to the timer of a closed widget
+        if self._update_timer.isActive():
+            self._update_timer.stop()
+            self._flush_overlay_update()
+        super().closeEvent(event)
+
+    def _update_color_button_icon(self, color_button, color_str):
+        color_button.setIcon(_color_icon(color_str))
+
+    def _show_color_dialog(self, color, slot):
+        # a single dialog is created per widget and shared by the buttons
+        if self.color_dialog is None:
+            self.color_dialog = QtWidgets.QColorDialog(parent=self)
+        self.color_dialog.setCurrentColor(QtGui.QColor(color))
+        self.color_dialog.open(slot)
+
+    def _open_color_dialog(self):
+        self._show_color_dialog(self.chosen_color, self._set_colour)
+
+    def _open_background_color_dialog(self):
+        self._show_color_dialog(
+            self.chosen_bgcolor, self._set_background_colour
+        )
+
+    def _open_outline_color_dialog(self):
+        self._show_color_dialog(
+            self.chosen_outline_color, self._set_outline_colour
+        )
+
+    def _set_colour(self):
+        color = self.color_dialog.selectedColor()
+        if not color.isValid() or color.name() == self.chosen_color:
+            return
+        self.chosen_color = color.name()
+        self._update_color_button_icon(self.color, self.chosen_color)
+        self._schedule_option("color", self.chosen_color)
+
+    def _set_background_colour(self):
+        color = self.color_dialog.selectedColor()
+        if not color.isValid() or color.name() == self.chosen_bgcolor:
+            return
+        self.chosen_bgcolor = color.name()
+        self._update_color_button_icon(self.bgcolor, self.chosen_bgcolor)
+        self._schedule_opacity(self.opacity_slider.value())
 
+    def _set_outline_colour(self):
+        color = self.color_dialog.selectedColor()
+        if not color.isValid() or color.name() == self.chosen_outline_color:
+            return
+        self.chosen_outline_color = color.name()
+        self._update_color_button_icon(
+            self.outline_color, self.chosen_outline_color
+        )
+        self._schedule_option(
+            "outline_color", _color_array(self.chosen_outline_color)
+        )
 
-class TimestampWidget(QtWidgets.QWidget):
+
+class TimestampWidget(_OverlayOptionsMixin, QtWidgets.QWidget):
     """
     A widget that provides options for the timestamp overlay in napari viewer.
 
@@ -51,8 +268,6 @@ class TimestampWidget(QtWidgets.QWidget):
         The parent widget, by default None.
     """
 
-    overlay_set: bool = False
-
     def __init__(self, viewer: napari.viewer.Viewer, parent=None):
         """
         Initialize the timestamp_options widget.
@@ -69,26 +284,34 @@ class TimestampWidget(QtWidgets.QWidget):
         self.chosen_bgcolor = "black"
         self.chosen_outline_color = "white"
         self.viewer = viewer
+        self._setup_overlay_updates()
         self._setupUi()
-        self._connect_all_changes()
+        # the overlay is written once with the defaults before the widgets
+        # are connected, so setting them up doesn't schedule any updates
         self._setup_overlay()
+        self._connect_all_changes()
 
     def _setup_overlay(self):
+        from napari._vispy.utils.visual import overlay_to_visual
+
+        from napari_timestamper._timestamp_overlay import (
+            TimestampOverlay,
+            VispyTimestampOverlay,
+        )
+
+        # only looking up and registering the overlay warns about napari's
+        # private API, the options are written outside of the filter
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
-            try:
-                self.viewer._overlays["timestamp"]
-            except KeyError:
-                self.viewer._overlays["timestamp"] = TimestampOverlay(
-                    visible=True
-                )
+            overlays = self.viewer._overlays
+            if "timestamp" not in overlays:
+                overlays["timestamp"] = TimestampOverlay(visible=True)
                 overlay_to_visual[TimestampOverlay] = VispyTimestampOverlay
-                self.viewer.window._qt_viewer.canvas._add_overlay_to_visual(
-                    self.viewer._overlays["timestamp"]
-                )
-            self.timestamp_overlay = self.viewer._overlays["timestamp"]
-            self._set_timestamp_overlay_options()
-            self.overlay_set = True
+                canvas = self.viewer.window._qt_viewer.canvas
+                canvas._add_overlay_to_visual(overlays["timestamp"])
+            self.timestamp_overlay = overlays["timestamp"]
+        self.overlay_set = True
+        self._set_overlay_options()
 
     def _toggle_overlay(self):
         if not self.overlay_set:
@@ -101,43 +324,18 @@ class TimestampWidget(QtWidgets.QWidget):
             self.toggle_timestamp.setText("Add Timestamp")
         else:
             self.timestamp_overlay.visible = True
+            # write the options changed while the overlay was hidden
+            self._flush_overlay_update()
             self.toggle_timestamp.setText("Remove Timestamp")
 
     def _setupUi(self):
-        self.setObjectName("Timestamp Options")
-        self.gridLayout = QtWidgets.QGridLayout()
-
-        self.time_axis_label = QtWidgets.QLabel("Time Axis")
-        self.time_axis = QtWidgets.QSpinBox()
-        self.time_axis.setRange(-10, 10)
-
-        self.start_time_label = QtWidgets.QLabel("Start Time")
-        self.start_time = QtWidgets.QSpinBox()
-        self.start_time.setRange(0, 10000)
-        self.start_time.setValue(0)
+        from napari.components._viewer_constants import CanvasPosition
+        from superqt import QLabeledSlider
 
-        self.step_time_label = QtWidgets.QLabel("Step Time")
-        self.step_time = QtWidgets.QDoubleSpinBox()
-        self.step_time.setRange(0, 10000)
-        self.step_time.setValue(1)
+        from napari_timestamper._timestamp_overlay import TimestampOverlay
 
-        self.prefix_label = QtWidgets.QLabel("Prefix")
-        self.prefix = QtWidgets.QLineEdit()
-        self.prefix.setText("")
-
-        self.suffix_label = QtWidgets.QLabel("Suffix")
-        self.suffix = QtWidgets.QLineEdit()
-        self.suffix.setText("")
-
-        self.position_label = QtWidgets.QLabel("Position")
-        self.position = QtWidgets.QComboBox()
-        self.position.addItems(CanvasPosition)
-        self.position.setCurrentIndex(1)
-
-        self.size_label = QtWidgets.QLabel("Size")
-        self.ts_size = QtWidgets.QSpinBox()
-        self.ts_size.setRange(0, 1000)
-        self.ts_size.setValue(12)
+        self.setObjectName("Timestamp Options")
+        self.formLayout = QtWidgets.QFormLayout()
 
         self.shift_label = QtWidgets.QLabel("XY Shift")
         self.shiftlayout = QtWidgets.QHBoxLayout()
@@ -150,15 +348,6 @@ class TimestampWidget(QtWidgets.QWidget):
         self.shiftlayout.addWidget(self.x_shift)
         self.shiftlayout.addWidget(self.y_shift)
 
-        self.time_format_label = QtWidgets.QLabel("Time Format")
-        self.time_format = QtWidgets.QComboBox()
-        self.time_format.addItems(
-            TimestampOverlay._get_allowed_format_specifiers()
-        )
-
-        self.color_label = QtWidgets.QLabel("Set Timestamp Color")
-        self.color = QtWidgets.QPushButton("Choose Color")
-
         # add checkbox for background
         self.bgcolor_checkbox = QtWidgets.QCheckBox("Background Color")
         self.bgcolor_checkbox.setChecked(False)
@@ -166,13 +355,6 @@ class TimestampWidget(QtWidgets.QWidget):
         self.bgcolor = QtWidgets.QPushButton("Choose Color")
         self.bgcolor.setEnabled(False)
 
-        # opacity Slider
-        self.opacity_label = QtWidgets.QLabel("Background Opacity")
-        self.opacity_slider = QLabeledSlider(QtCore.Qt.Horizontal)
-        self.opacity_slider.setRange(0, 100)
-        self.opacity_slider.setValue(100)
-        self.opacity_label.setEnabled(False)
-
         # outline checkbox
         self.outline_checkbox = QtWidgets.QCheckBox("Outline")
         self.outline_checkbox.setChecked(False)
@@ -181,12 +363,6 @@ class TimestampWidget(QtWidgets.QWidget):
         self.outline_color = QtWidgets.QPushButton("Choose Outline Color")
         self.outline_color.setEnabled(False)
 
-        # outline_size
-        self.outline_size_label = QtWidgets.QLabel("Outline Size")
-        self.outline_size = QtWidgets.QDoubleSpinBox()
-        self.outline_size.setRange(0, 100)
-        self.outline_size.setValue(0.2)
-
         # add checkbox for bold and italic
         self.bold_checkbox = QtWidgets.QCheckBox("Bold")
         self.bold_checkbox.setChecked(False)
@@ -202,50 +378,41 @@ class TimestampWidget(QtWidgets.QWidget):
 
         self.toggle_timestamp = QtWidgets.QPushButton("Add Timestamp")
 
-        self.gridLayout.addWidget(self.time_axis_label, 0, 0)
-        self.gridLayout.addWidget(self.time_axis, 0, 1)
-        self.gridLayout.addWidget(self.start_time_label, 1, 0)
-        self.gridLayout.addWidget(self.start_time, 1, 1)
-        self.gridLayout.addWidget(self.step_time_label, 2, 0)
-        self.gridLayout.addWidget(self.step_time, 2, 1)
-        self.gridLayout.addWidget(self.prefix_label, 3, 0)
-        self.gridLayout.addWidget(self.prefix, 3, 1)
-        self.gridLayout.addWidget(self.suffix_label, 4, 0)
-        self.gridLayout.addWidget(self.suffix, 4, 1)
-        self.gridLayout.addWidget(self.position_label, 5, 0)
-        self.gridLayout.addWidget(self.position, 5, 1)
-        self.gridLayout.addWidget(self.size_label, 6, 0)
-        self.gridLayout.addWidget(self.ts_size, 6, 1)
-        self.gridLayout.addWidget(self.shift_label, 7, 0)
-        self.gridLayout.addLayout(self.shiftlayout, 7, 1)
-        self.gridLayout.addWidget(self.time_format_label, 8, 0)
-        self.gridLayout.addWidget(self.time_format, 8, 1)
-        self.gridLayout.addWidget(self.color_label, 9, 0)
-        self.gridLayout.addWidget(self.color, 9, 1)
-        self.gridLayout.addWidget(self.outline_checkbox, 10, 0)
-        self.gridLayout.addWidget(self.outline_color, 10, 1)
-        self.gridLayout.addWidget(self.outline_size_label, 11, 0)
-        self.gridLayout.addWidget(self.outline_size, 11, 1)
-
-        self.gridLayout.addWidget(self.bgcolor_checkbox, 12, 0)
-        self.gridLayout.addWidget(self.bgcolor, 12, 1)
-        self.gridLayout.addWidget(self.opacity_label, 13, 0)
-        self.gridLayout.addWidget(self.opacity_slider, 13, 1)
-
-        self.gridLayout.addWidget(self.bold_checkbox, 14, 0)
-        self.gridLayout.addWidget(self.italic_checkbox, 14, 1)
-        self.gridLayout.addWidget(self.display_on_scene, 15, 1)
-        self.gridLayout.addWidget(self.scale_with_zoom, 15, 0)
-        self.gridLayout.addWidget(self.toggle_timestamp, 16, 0, 1, 2)
-        self.setLayout(self.gridLayout)
-
-        self.spacer = QtWidgets.QSpacerItem(
-            20,
-            40,
-            QtWidgets.QSizePolicy.Minimum,
-            QtWidgets.QSizePolicy.Expanding,
+        # fmt: off
+        rows = (
+            ("time_axis_label", "Time Axis", "time_axis",
+             QSpinBox, {"range": (-10, 10)}),
+            ("start_time_label", "Start Time", "start_time",
+             QSpinBox, {"range": (0, 10000), "value": 0}),
+            ("step_time_label", "Step Time", "step_time",
+             QDoubleSpinBox, {"range": (0, 10000), "value": 1}),
+            ("prefix_label", "Prefix", "prefix", QLineEdit, {}),
+            ("suffix_label", "Suffix", "suffix", QLineEdit, {}),
+            ("position_label", "Position", "position",
+             QComboBox, {"items": _enum_items(CanvasPosition), "index": 1}),
+            ("size_label", "Size", "ts_size",
+             QSpinBox, {"range": (0, 1000), "value": 12}),
+            (self.shift_label, self.shiftlayout),
+            ("time_format_label", "Time Format", "time_format",
+             QComboBox,
+             {"items": TimestampOverlay._get_allowed_format_specifiers()}),
+            ("color_label", "Set Timestamp Color", "color",
+             QPushButton, {"text": "Choose Color"}),
+            (self.outline_checkbox, self.outline_color),
+            ("outline_size_label", "Outline Size", "outline_size",
+             QDoubleSpinBox, {"range": (0, 100), "value": 0.2}),
+            (self.bgcolor_checkbox, self.bgcolor),
+            ("opacity_label", "Background Opacity", "opacity_slider",
+             partial(QLabeledSlider, QtCore.Qt.Horizontal),
+             {"range": (0, 100), "value": 100}),
+            (self.bold_checkbox, self.italic_checkbox),
+            (self.scale_with_zoom, self.display_on_scene),
+            (self.toggle_timestamp,),
         )
-        self.gridLayout.addItem(self.spacer, 17, 0, 1, 2)
+        # fmt: on
+        _add_form_rows(self, self.formLayout, rows)
+        self.opacity_label.setEnabled(False)
+        self.setLayout(self.formLayout)
 
         self._update_color_button_icon(self.color, self.chosen_color)
         self._update_color_button_icon(self.bgcolor, self.chosen_bgcolor)
@@ -253,26 +420,20 @@ class TimestampWidget(QtWidgets.QWidget):
             self.outline_color, self.chosen_outline_color
         )
 
-    def _update_color_button_icon(self, color_button, color_str):
-        pixmap = QtGui.QPixmap(20, 20)  # Create a QPixmap of size 20x20
-        pixmap.fill(
-            QtGui.QColor(color_str)
-        )  # Fill the pixmap with the chosen color
-        icon = QtGui.QIcon(pixmap)  # Convert pixmap to QIcon
-        color_button.setIcon(icon)  # Set the icon for the button
-
     def _toggle_bgcolor(self):
         if self.bgcolor_checkbox.isChecked():
             self.bgcolor.setEnabled(True)
             self.opacity_label.setEnabled(True)
             self.opacity_slider.setEnabled(True)
-            self._set_timestamp_overlay_options()
+            self._update_color_button_icon(self.bgcolor, self.chosen_bgcolor)
+            self._schedule_option("show_background", True)
+            self._schedule_opacity(self.opacity_slider.value())
         else:
             self.bgcolor.setEnabled(False)
             self.opacity_label.setEnabled(False)
             self.opacity_slider.setEnabled(False)
             self._update_color_button_icon(self.bgcolor, "grey")
-            self._set_timestamp_overlay_options()
+            self._schedule_option("show_background", False)
 
     def _on_outline_color_combobox_change(self):
         """
@@ -281,126 +442,91 @@ class TimestampWidget(QtWidgets.QWidget):
         if not self.outline_checkbox.isChecked():
             self.outline_color.setEnabled(False)
             self._update_color_button_icon(self.outline_color, "grey")
-            self.timestamp_overlay.show_outline = False
+            self._schedule_option("show_outline", False)
         else:
             self.outline_color.setEnabled(True)
             self._update_color_button_icon(
                 self.outline_color, self.chosen_outline_color
             )
-            self.timestamp_overlay.show_outline = True
-            self.timestamp_overlay.outline_color = ColorArray(
-                self.chosen_outline_color
+            self._schedule_option("show_outline", True)
+            self._schedule_option(
+                "outline_color", _color_array(self.chosen_outline_color)
             )
 
-    def _open_color_dialog(self):
-        self.color_dialog = QtWidgets.QColorDialog(parent=self)
-        self.color_dialog.open(self._set_colour)
-
-    def _open_background_color_dialog(self):
-        self.bg_color_dialog = QtWidgets.QColorDialog(parent=self)
-        self.bg_color_dialog.open(self._set_background_colour)
-
-    def _open_outline_color_dialog(self):
-        self.color_dialog = QtWidgets.QColorDialog(parent=self)
-        self.color_dialog.open(self._set_outline_colour)
-
-    def _set_colour(self):
-        color = self.color_dialog.selectedColor()
-        if color.isValid():
-            self.chosen_color = color.name()
-            self._update_color_button_icon(self.color, self.chosen_color)
-            self._set_timestamp_overlay_options()
-
-    def _set_background_colour(self):
-        color = self.bg_color_dialog.selectedColor()
-        if color.isValid():
-            self.chosen_bgcolor = color.name()
-            self._update_color_button_icon(self.bgcolor, self.chosen_color)
-            self._set_timestamp_overlay_options()
-
-    def _set_outline_colour(self):
-        color = self.color_dialog.selectedColor()
-        if color.isValid():
-            self.chosen_outline_color = color.name()
-            self._update_color_button_icon(
-                self.outline_color, self.chosen_outline_color
-            )
-            self._set_timestamp_overlay_options()
-
-    def _set_timestamp_overlay_options(self):
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            timestamp_overlay = self.viewer._overlays["timestamp"]
-        timestamp_overlay.color = self.chosen_color
-        timestamp_overlay.bold = self.bold_checkbox.isChecked()
-        timestamp_overlay.italic = self.italic_checkbox.isChecked()
-        timestamp_overlay.size = self.ts_size.value()
-        timestamp_overlay.position = self.position.currentText()
-        timestamp_overlay.prefix = self.prefix.text()
-        timestamp_overlay.custom_suffix = (
-            self.suffix.text() if self.suffix else None
-        )
-        timestamp_overlay.start_time = self.start_time.value()
-        timestamp_overlay.step_size = self.step_time.value()
-        timestamp_overlay.time_format = self.time_format.currentText()
-        timestamp_overlay.x_spacer = self.x_shift.value()
-        timestamp_overlay.y_spacer = self.y_shift.value()
-        timestamp_overlay.time_axis = self.time_axis.value()
-        timestamp_overlay.display_on_scene = self.display_on_scene.isChecked()
-        timestamp_overlay.scale_with_zoom = self.scale_with_zoom.isChecked()
-        timestamp_overlay.bg_color = ColorArray(
-            self.chosen_bgcolor, alpha=self.opacity_slider.value() / 100
-        )
-        timestamp_overlay.show_background = self.bgcolor_checkbox.isChecked()
-        timestamp_overlay.show_outline = self.outline_checkbox.isChecked()
-        timestamp_overlay.outline_color = ColorArray(self.chosen_outline_color)
-        timestamp_overlay.outline_thickness = self.outline_size.value()
+    @property
+    def _overlay(self):
+        return self.timestamp_overlay
+
+    def _overlay_options(self):
+        return {
+            "color": self.chosen_color,
+            "bold": self.bold_checkbox.isChecked(),
+            "italic": self.italic_checkbox.isChecked(),
+            "size": self.ts_size.value(),
+            "position": self.position.currentText(),
+            "prefix": self.prefix.text(),
+            "custom_suffix": self.suffix.text() if self.suffix else None,
+            "start_time": self.start_time.value(),
+            "step_size": self.step_time.value(),
+            "time_format": self.time_format.currentText(),
+            "x_spacer": self.x_shift.value(),
+            "y_spacer": self.y_shift.value(),
+            "time_axis": self.time_axis.value(),
+            "display_on_scene": self.display_on_scene.isChecked(),
+            "scale_with_zoom": self.scale_with_zoom.isChecked(),
+            "bg_color": _color_array(
+                self.chosen_bgcolor, alpha=self.opacity_slider.value() / 100
+            ),
+            "show_background": self.bgcolor_checkbox.isChecked(),
+            "show_outline": self.outline_checkbox.isChecked(),
+            "outline_color": _color_array(self.chosen_outline_color),
+            "outline_thickness": self.outline_size.value(),
+        }
 
     def _connect_all_changes(self):
-        for i in [
-            self.time_axis,
-            self.start_time,
-            self.step_time,
-            self.ts_size,
-            self.x_shift,
-            self.y_shift,
+        # each widget sends its own value, see _schedule_option
+        for name, i in [
+            ("time_axis", self.time_axis),
+            ("start_time", self.start_time),
+            ("step_size", self.step_time),
+            ("size", self.ts_size),
+            ("x_spacer", self.x_shift),
+            ("y_spacer", self.y_shift),
+            ("outline_thickness", self.outline_size),
         ]:
-            i.valueChanged.connect(self._set_timestamp_overlay_options)
-        for i in [self.prefix, self.suffix]:
-            i.textChanged.connect(self._set_timestamp_overlay_options)
-        for i in [self.position, self.time_format]:
-            i.currentTextChanged.connect(self._set_timestamp_overlay_options)
+            i.valueChanged.connect(partial(self._schedule_option, name))
+        for name, i in [
+            ("prefix", self.prefix),
+            ("custom_suffix", self.suffix),
+        ]:
+            i.textChanged.connect(partial(self._schedule_option, name))
+        for name, i in [
+            ("position", self.position),
+            ("time_format", self.time_format),
+        ]:
+            i.currentTextChanged.connect(partial(self._schedule_option, name))
+        for name, i in [
+            ("display_on_scene", self.display_on_scene),
+            ("scale_with_zoom", self.scale_with_zoom),
+            ("bold", self.bold_checkbox),
+            ("italic", self.italic_checkbox),
+        ]:
+            i.stateChanged.connect(
+                partial(self._schedule_checkbox_option, name, i)
+            )
         self.toggle_timestamp.clicked.connect(self._toggle_overlay)
 
         self.color.clicked.connect(self._open_color_dialog)
-        self.color.clicked.connect(self._set_timestamp_overlay_options)
-        self.display_on_scene.stateChanged.connect(
-            self._set_timestamp_overlay_options
-        )
-        self.scale_with_zoom.stateChanged.connect(
-            self._set_timestamp_overlay_options
-        )
-        self.bold_checkbox.stateChanged.connect(
-            self._set_timestamp_overlay_options
-        )
-        self.italic_checkbox.stateChanged.connect(
-            self._set_timestamp_overlay_options
-        )
         self.bgcolor_checkbox.stateChanged.connect(self._toggle_bgcolor)
         self.bgcolor.clicked.connect(self._open_background_color_dialog)
-        self.opacity_slider.valueChanged.connect(
-            self._set_timestamp_overlay_options
-        )
+        self.opacity_slider.valueChanged.connect(self._schedule_opacity)
         self.outline_checkbox.stateChanged.connect(
             self._on_outline_color_combobox_change
         )
         self.outline_color.clicked.connect(self._open_outline_color_dialog)
-        self.outline_size.valueChanged.connect(
-            self._set_timestamp_overlay_options
-        )
 
 
-class LayerAnnotationsWidget(QtWidgets.QWidget):
+class LayerAnnotationsWidget(_OverlayOptionsMixin, QtWidgets.QWidget):
     """
     A widget that provides options for the layer annotator overlay in napari viewer.
 
@@ -412,56 +538,54 @@ class LayerAnnotationsWidget(QtWidgets.QWidget):
         The parent widget, by default None.
     """
 
-    overlay_set: bool = False
-
     def __init__(self, viewer: napari.viewer.Viewer, parent=None):
         super().__init__(parent)
         self.viewer = viewer
         self.chosen_color = "white"  # Default color
         self.chosen_bgcolor = "black"  # Default color
         self.chosen_outline_color = "white"  # Default color
+        self._setup_overlay_updates()
         self._setupUi()
-        self._connect_all_changes()
-        self._setup_overlay()
-        self._set_layer_annotator_overlay_options()
+        # apply the initial checkbox states to the buttons, then write the
+        # overlay once with the defaults before the widgets are connected
         self._on_color_combobox_change()
         self._on_background_color_combobox_change()
+        self._setup_overlay()
+        self._connect_all_changes()
 
     def _setup_overlay(self):
+        from napari._vispy.utils.visual import overlay_to_visual
+
+        from napari_timestamper._layer_annotator_overlay import (
+            LayerAnnotatorOverlay,
+            VispyLayerAnnotatorOverlay,
+        )
+
+        # only looking up and registering the overlay warns about napari's
+        # private API, the options are written outside of the filter
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
-            try:
-                self.viewer._overlays["LayerAnnotator"]
-            except KeyError:
-                self.viewer._overlays[
-                    "LayerAnnotator"
-                ] = LayerAnnotatorOverlay(visible=True)
+            overlays = self.viewer._overlays
+            if "LayerAnnotator" not in overlays:
+                overlays["LayerAnnotator"] = LayerAnnotatorOverlay(
+                    visible=True
+                )
                 overlay_to_visual[
                     LayerAnnotatorOverlay
                 ] = VispyLayerAnnotatorOverlay
-                self.viewer.window._qt_viewer.canvas._add_overlay_to_visual(
-                    self.viewer._overlays["LayerAnnotator"]
-                )
-            self.layer_annotator_overlay = self.viewer._overlays[
-                "LayerAnnotator"
-            ]
-            self._set_layer_annotator_overlay_options()
-            self.overlay_set = True
+                canvas = self.viewer.window._qt_viewer.canvas
+                canvas._add_overlay_to_visual(overlays["LayerAnnotator"])
+            self.layer_annotator_overlay = overlays["LayerAnnotator"]
+        self.overlay_set = True
+        self._set_overlay_options()
 
     def _setupUi(self):
-        self.setObjectName("Layer Annotator Options")
-        self.gridLayout = QtWidgets.QGridLayout(self)
+        from superqt import QLabeledSlider
 
-        # Size Slider
-        self.size_label = QtWidgets.QLabel("Size")
-        self.size_slider = QLabeledSlider(QtCore.Qt.Horizontal)
-        self.size_slider.setRange(1, 100)
-        self.size_slider.setValue(12)
+        from napari_timestamper._layer_annotator_overlay import ScenePosition
 
-        # Position Selector
-        self.position_label = QtWidgets.QLabel("Position")
-        self.position_combobox = QtWidgets.QComboBox()
-        self.position_combobox.addItems(ScenePosition)
+        self.setObjectName("Layer Annotator Options")
+        self.formLayout = QtWidgets.QFormLayout(self)
 
         # X and Y Position Offset
         self.xy_offset_label = QtWidgets.QLabel("XY Position Offset")
@@ -482,24 +606,11 @@ class LayerAnnotationsWidget(QtWidgets.QWidget):
         self.toggle_visibility_button.setCheckable(True)
         self.toggle_visibility_button.setChecked(True)
 
-        # Adding Widgets to Layout
-        self.gridLayout.addWidget(self.size_label, 0, 0)
-        self.gridLayout.addWidget(self.size_slider, 0, 1)
-
-        self.gridLayout.addWidget(self.position_label, 1, 0)
-        self.gridLayout.addWidget(self.position_combobox, 1, 1)
-
-        self.gridLayout.addWidget(self.xy_offset_label, 2, 0)
-        self.gridLayout.addLayout(self.offset_layout, 2, 1)
-
-        self.gridLayout.addWidget(self.toggle_visibility_button, 10, 0, 1, 2)
-
         # Choose wether to use layer color or custom color by ticking the checkbox
         self.color_checkbox = QtWidgets.QCheckBox(
             "Use Colormap for Image Layers"
         )
         self.color_checkbox.setChecked(True)
-        self.gridLayout.addWidget(self.color_checkbox, 4, 0)
 
         # Color Picker
         self.color = QtWidgets.QPushButton("Choose Color")
@@ -507,22 +618,16 @@ class LayerAnnotationsWidget(QtWidgets.QWidget):
             self.color, self.chosen_color
         )  # Update button icon
 
-        # Adding Color Picker to Layout
-        self.gridLayout.addWidget(self.color, 4, 1)
-
         # Add Checkbox for bold and italic
         self.bold_checkbox = QtWidgets.QCheckBox("Bold")
         self.bold_checkbox.setChecked(False)
-        self.gridLayout.addWidget(self.bold_checkbox, 5, 0)
 
         self.italic_checkbox = QtWidgets.QCheckBox("Italic")
         self.italic_checkbox.setChecked(False)
-        self.gridLayout.addWidget(self.italic_checkbox, 5, 1)
 
         # Choose wether to use layer color or custom color by ticking the checkbox
         self.bgcolor_checkbox = QtWidgets.QCheckBox("Show Background Color")
         self.bgcolor_checkbox.setChecked(False)
-        self.gridLayout.addWidget(self.bgcolor_checkbox, 6, 0)
 
         # Color Picker
         self.bgcolor = QtWidgets.QPushButton("Choose Color")
@@ -530,20 +635,6 @@ class LayerAnnotationsWidget(QtWidgets.QWidget):
             self.bgcolor, self.chosen_bgcolor
         )  # Update button icon
 
-        # Adding Color Picker to Layout
-        self.gridLayout.addWidget(self.bgcolor, 6, 1)
-
-        # opacity Slider
-        self.opacity_label = QtWidgets.QLabel("Background Opacity")
-
-        self.opacity_slider = QLabeledSlider(QtCore.Qt.Horizontal)
-        self.opacity_slider.setRange(0, 100)
-        self.opacity_slider.setValue(100)
-
-        # Adding Widgets to Layout
-        self.gridLayout.addWidget(self.opacity_label, 7, 0)
-        self.gridLayout.addWidget(self.opacity_slider, 7, 1)
-
         # Choose wether to show outline or not
         self.outline_checkbox = QtWidgets.QCheckBox("Show Outline")
         self.outline_checkbox.setChecked(False)
@@ -555,33 +646,29 @@ class LayerAnnotationsWidget(QtWidgets.QWidget):
             self.outline_color, self.chosen_outline_color
         )  # Update button icon
 
-        # Adding Widgets to Layout
-        self.gridLayout.addWidget(self.outline_checkbox, 8, 0)
-        self.gridLayout.addWidget(self.outline_color, 8, 1)
-
-        # set outline size
-        self.outline_size_label = QtWidgets.QLabel("Outline Size")
-        self.outline_size = QtWidgets.QDoubleSpinBox()
-        self.outline_size.setRange(0, 100)
-        self.outline_size.setValue(0.2)
-
-        # Adding Widgets to Layout
-        self.gridLayout.addWidget(self.outline_size_label, 9, 0)
-        self.gridLayout.addWidget(self.outline_size, 9, 1)
-
-        self.spacer = QtWidgets.QSpacerItem(
-            20,
-            40,
-            QtWidgets.QSizePolicy.Minimum,
-            QtWidgets.QSizePolicy.Expanding,
+        # fmt: off
+        rows = (
+            ("size_label", "Size", "size_slider",
+             partial(QLabeledSlider, QtCore.Qt.Horizontal),
+             {"range": (1, 100), "value": 12}),
+            ("position_label", "Position", "position_combobox",
+             QComboBox, {"items": _enum_items(ScenePosition)}),
+            (self.xy_offset_label, self.offset_layout),
+            (self.color_checkbox, self.color),
+            (self.bold_checkbox, self.italic_checkbox),
+            (self.bgcolor_checkbox, self.bgcolor),
+            ("opacity_label", "Background Opacity", "opacity_slider",
+             partial(QLabeledSlider, QtCore.Qt.Horizontal),
+             {"range": (0, 100), "value": 100}),
+            (self.outline_checkbox, self.outline_color),
+            ("outline_size_label", "Outline Size", "outline_size",
+             QDoubleSpinBox, {"range": (0, 100), "value": 0.2}),
+            (self.toggle_visibility_button,),
         )
-        self.gridLayout.addItem(self.spacer, 11, 0, 1, 2)
-
-        # Set the layout to the widget
-        self.setLayout(self.gridLayout)
+        # fmt: on
+        _add_form_rows(self, self.formLayout, rows)
 
         # Connect the toggle visibility button to its slot
-        self.size_slider.valueChanged.connect(self._on_size_slider_change)
         self.toggle_visibility_button.clicked.connect(self._toggle_visibility)
         self.color_checkbox.stateChanged.connect(
             self._on_color_combobox_change
@@ -590,28 +677,18 @@ class LayerAnnotationsWidget(QtWidgets.QWidget):
             self._on_background_color_combobox_change
         )
 
-    def _update_color_button_icon(self, color_button, color_str):
-        pixmap = QtGui.QPixmap(20, 20)  # Create a QPixmap of size 20x20
-        pixmap.fill(
-            QtGui.QColor(color_str)
-        )  # Fill the pixmap with the chosen color
-        icon = QtGui.QIcon(pixmap)  # Convert pixmap to QIcon
-        color_button.setIcon(icon)  # Set the icon for the button
-
     def _on_color_combobox_change(self):
         """
         Slot function to handle changes in the color combobox.
         """
         if self.color_checkbox.isChecked():
             self._update_color_button_icon(self.color, self.chosen_color)
-            self.layer_annotator_overlay.use_layer_color = True
+            self._schedule_option("use_layer_color", True)
 
         else:
             self.color.setEnabled(True)
             self._update_color_button_icon(self.color, self.chosen_color)
-            self.layer_annotator_overlay.use_layer_color = False
-
-        self._set_layer_annotator_overlay_options()
+            self._schedule_option("use_layer_color", False)
 
     def _on_background_color_combobox_change(self):
         """
@@ -620,16 +697,14 @@ class LayerAnnotationsWidget(QtWidgets.QWidget):
         if not self.bgcolor_checkbox.isChecked():
             self.bgcolor.setEnabled(False)
             self._update_color_button_icon(self.bgcolor, "grey")
-            self.layer_annotator_overlay.show_background = False
+            self._schedule_option("show_background", False)
             self.opacity_label.setEnabled(False)
             self.opacity_slider.setEnabled(False)
         else:
             self.bgcolor.setEnabled(True)
             self._update_color_button_icon(self.bgcolor, self.chosen_bgcolor)
-            self.layer_annotator_overlay.show_background = True
-            self.layer_annotator_overlay.bg_color = ColorArray(
-                self.chosen_bgcolor, alpha=self.opacity_slider.value() / 100
-            )
+            self._schedule_option("show_background", True)
+            self._schedule_opacity(self.opacity_slider.value())
             self.opacity_label.setEnabled(True)
             self.opacity_slider.setEnabled(True)
 
@@ -640,150 +715,86 @@ class LayerAnnotationsWidget(QtWidgets.QWidget):
         if not self.outline_checkbox.isChecked():
             self.outline_color.setEnabled(False)
             self._update_color_button_icon(self.outline_color, "grey")
-            self.layer_annotator_overlay.show_outline = False
+            self._schedule_option("show_outline", False)
         else:
             self.outline_color.setEnabled(True)
             self._update_color_button_icon(
-                self.outline_color, self.chosen_color
+                self.outline_color, self.chosen_outline_color
             )
-            self.layer_annotator_overlay.show_outline = True
-            self.layer_annotator_overlay.outline_color = ColorArray(
-                self.chosen_outline_color
+            self._schedule_option("show_outline", True)
+            self._schedule_option(
+                "outline_color", _color_array(self.chosen_outline_color)
             )
 
-    def _open_color_dialog(self):
-        self.color_dialog = QtWidgets.QColorDialog(parent=self)
-        self.color_dialog.open(self._set_colour)
-
-    def _open_background_color_dialog(self):
-        self.color_dialog = QtWidgets.QColorDialog(parent=self)
-        self.color_dialog.open(self._set_background_colour)
-
-    def _open_outline_color_dialog(self):
-        self.color_dialog = QtWidgets.QColorDialog(parent=self)
-        self.color_dialog.open(self._set_outline_colour)
-
-    def _set_colour(self):
-        color = self.color_dialog.selectedColor()
-        if color.isValid():
-            self.chosen_color = color.name()
-            self._update_color_button_icon(self.color, self.chosen_color)
-            self._set_layer_annotator_overlay_options()
-
-    def _set_background_colour(self):
-        color = self.color_dialog.selectedColor()
-        if color.isValid():
-            self.chosen_bgcolor = color.name()
-            self._update_color_button_icon(self.bgcolor, self.chosen_color)
-            self._set_layer_annotator_overlay_options()
-            self._on_background_color_combobox_change()
-
-    def _set_outline_colour(self):
-        color = self.color_dialog.selectedColor()
-        if color.isValid():
-            self.chosen_outline_color = color.name()
-            self._update_color_button_icon(
-                self.outline_color, self.chosen_color
-            )
-            self._set_layer_annotator_overlay_options()
-
-    def _set_opacity(self):
-        self.layer_annotator_overlay.bg_color = ColorArray(
-            self.chosen_bgcolor, alpha=self.opacity_slider.value() / 100
-        )
-
     def _toggle_visibility(self):
         self.layer_annotator_overlay.visible = (
             not self.layer_annotator_overlay.visible
         )
+        # write the options changed while the overlay was hidden
+        self._flush_overlay_update()
         self.toggle_visibility_button.setText(
             "Hide Overlay"
             if self.layer_annotator_overlay.visible
             else "Show Overlay"
         )
 
-    def _on_size_slider_change(self):
-        """
-        Slot function to handle changes in the size slider.
-        """
-        new_size = self.size_slider.value()
-        # Update the overlay size
-        if self.overlay_set:
-            self.layer_annotator_overlay.size = new_size
+    @property
+    def _overlay(self):
+        return self.layer_annotator_overlay
 
-    def _set_layer_annotator_overlay_options(self):
+    def _overlay_options(self):
         """
-        Set options for LayerAnnotatorOverlay based on the widget inputs.
+        Returns the options for LayerAnnotatorOverlay based on the widget
+        inputs.
         """
-        if self.overlay_set:
-            # Update the overlay properties
-            self.layer_annotator_overlay.position = (
-                self.position_combobox.currentText()
-            )
-            self.layer_annotator_overlay.x_spacer = (
-                self.x_offset_spinbox.value()
-            )
-            self.layer_annotator_overlay.y_spacer = (
-                self.y_offset_spinbox.value()
-            )
+        return {
+            "size": self.size_slider.value(),
+            "position": self.position_combobox.currentText(),
+            "x_spacer": self.x_offset_spinbox.value(),
+            "y_spacer": self.y_offset_spinbox.value(),
+            "use_layer_color": self.color_checkbox.isChecked(),
             # get the color from the color picker
-            self.layer_annotator_overlay.color = (
-                self.chosen_color
-            )  # Set color for overlay
-            self.layer_annotator_overlay.bold = self.bold_checkbox.isChecked()
-            self.layer_annotator_overlay.italic = (
-                self.italic_checkbox.isChecked()
-            )
-            self.layer_annotator_overlay.show_background = (
-                self.bgcolor_checkbox.isChecked()
-            )
-            self.layer_annotator_overlay.bg_color = ColorArray(
+            "color": self.chosen_color,
+            "bold": self.bold_checkbox.isChecked(),
+            "italic": self.italic_checkbox.isChecked(),
+            "show_background": self.bgcolor_checkbox.isChecked(),
+            "bg_color": _color_array(
                 self.chosen_bgcolor, alpha=self.opacity_slider.value() / 100
-            )
-            self.layer_annotator_overlay.show_outline = (
-                self.outline_checkbox.isChecked()
-            )
-            self.layer_annotator_overlay.outline_color = ColorArray(
-                self.chosen_outline_color
-            )
-            self.layer_annotator_overlay.outline_thickness = (
-                self.outline_size.value()
-            )
+            ),
+            "show_outline": self.outline_checkbox.isChecked(),
+            "outline_color": _color_array(self.chosen_outline_color),
+            "outline_thickness": self.outline_size.value(),
+        }
 
     def _connect_all_changes(self):
         """
         Connects all the widget changes to their respective slots.
         """
+        # each widget sends its own value, see _schedule_option
         self.position_combobox.currentTextChanged.connect(
-            self._set_layer_annotator_overlay_options
-        )
-        self.x_offset_spinbox.valueChanged.connect(
-            self._set_layer_annotator_overlay_options
-        )
-        self.y_offset_spinbox.valueChanged.connect(
-            self._set_layer_annotator_overlay_options
+            partial(self._schedule_option, "position")
         )
+        for name, i in [
+            ("size", self.size_slider),
+            ("x_spacer", self.x_offset_spinbox),
+            ("y_spacer", self.y_offset_spinbox),
+            ("outline_thickness", self.outline_size),
+        ]:
+            i.valueChanged.connect(partial(self._schedule_option, name))
+        for name, i in [
+            ("bold", self.bold_checkbox),
+            ("italic", self.italic_checkbox),
+        ]:
+            i.stateChanged.connect(
+                partial(self._schedule_checkbox_option, name, i)
+            )
         self.color.clicked.connect(self._open_color_dialog)
-        self.color.clicked.connect(self._set_layer_annotator_overlay_options)
         self.bgcolor.clicked.connect(self._open_background_color_dialog)
-        self.bgcolor.clicked.connect(self._set_layer_annotator_overlay_options)
-        self.bold_checkbox.stateChanged.connect(
-            self._set_layer_annotator_overlay_options
-        )
-        self.italic_checkbox.stateChanged.connect(
-            self._set_layer_annotator_overlay_options
-        )
-        self.opacity_slider.valueChanged.connect(self._set_opacity)
+        self.opacity_slider.valueChanged.connect(self._schedule_opacity)
         self.outline_checkbox.stateChanged.connect(
             self._on_outline_color_combobox_change
         )
         self.outline_color.clicked.connect(self._open_outline_color_dialog)
-        self.outline_color.clicked.connect(
-            self._set_layer_annotator_overlay_options
-        )
-        self.outline_size.valueChanged.connect(
-            self._set_layer_annotator_overlay_options
-        )
 
 
 class RenderRGBWidget(QWidget):
@@ -861,6 +872,14 @@ class RenderRGBWidget(QWidget):
         self.filepath_button.clicked.connect(self.on_filepath_button_clicked)
         self.render_button.clicked.connect(self.on_render_button_clicked)
 
+    def closeEvent(self, event):
+        # the viewer outlives the widget, stop it from updating a closed one
+        self.viewer.layers.events.inserted.disconnect(
+            self.update_axis_combobox
+        )
+        self.viewer.layers.events.removed.disconnect(self.update_axis_combobox)
+        super().closeEvent(event)
+
     def update_axis_combobox(self):
         self.axis_combobox.clear()
         self.axis_combobox.addItem("None", None)
@@ -881,11 +900,22 @@ class RenderRGBWidget(QWidget):
 
     @Slot()
     def on_render_button_clicked(self):
-        rendered_image = render_as_rgb(
-            self.viewer,
-            self.axis_combobox.currentData(),
-            upsample_factor=self.scale_spinbox.value(),
+        from napari_timestamper.render_as_rgb import (
+            render_as_rgb,
+            render_as_rgb_iter,
+            save_image_stack,
         )
+
+        axis = self.axis_combobox.currentData()
+        if axis is None:
+            rendered_image = render_as_rgb(
+                self.viewer, upsample_factor=self.scale_spinbox.value()
+            )
+        else:
+            # the frames are written as they are rendered
+            rendered_image = render_as_rgb_iter(
+                self.viewer, axis, upsample_factor=self.scale_spinbox.value()
+            )
         save_image_stack(
             rendered_image,
             self.directory,
@@ -955,25 +985,42 @@ class LayertoRGBWidget(QWidget):
         self.viewer.layers.events.removed.connect(self._update_layer_selector)
         self.render_button.clicked.connect(self.on_render_button_clicked)
 
+    def closeEvent(self, event):
+        # the viewer outlives the widget, stop it from updating a closed one
+        self.viewer.layers.events.inserted.disconnect(
+            self._update_layer_selector
+        )
+        self.viewer.layers.events.removed.disconnect(
+            self._update_layer_selector
+        )
+        super().closeEvent(event)
+
     def render_layers_as_rgb(self, layers):
-        temporary_removed_layers = {}
-        # loop over all layers, position them in the center of the canvas, render them, and save them
-        for layer_idx, layer in enumerate(self.viewer.layers):
-            if layer in layers:
-                layer.visible = True
-            else:
-                temporary_removed_layers[layer_idx] = self.viewer.layers.pop(
-                    layer_idx
-                )
+        from napari_timestamper.render_as_rgb import render_as_rgb
 
-        ax = [idx for idx, ax in enumerate(self.viewer.dims.range[:-2])]
-        if len(ax) == 0:
-            ax = None
-        # loop over all axis
+        removed_layers = []
         try:
+            # the other layers are removed rather than hidden, as hidden
+            # layers still count towards the dims range, the extent and the
+            # grid. They are popped from the back, so that the indices of
+            # the layers still to be visited don't shift
+            for layer_idx in reversed(range(len(self.viewer.layers))):
+                layer = self.viewer.layers[layer_idx]
+                if layer in layers:
+                    layer.visible = True
+                else:
+                    removed_layers.append(
+                        (layer_idx, self.viewer.layers.pop(layer_idx))
+                    )
+
+            ax = [idx for idx, ax in enumerate(self.viewer.dims.range[:-2])]
+            if len(ax) == 0:
+                ax = None
+            # loop over all axis
             rendered_image = render_as_rgb(self.viewer, ax, 1)
         finally:
-            for layer_idx, layer in temporary_removed_layers.items():
+            # reinserted front to back, each at its original index
+            for layer_idx, layer in reversed(removed_layers):
                 self.viewer.layers.insert(layer_idx, layer)
         return rendered_image
 
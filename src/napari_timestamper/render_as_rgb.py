@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import os
 import warnings
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Literal, Optional, Union
 
 import napari
 import numpy as np
-from skimage import io
 
 
 def render_as_rgb(
@@ -15,7 +18,11 @@ def render_as_rgb(
     upsample_factor: int = 1,
     **kwargs,
 ):
-    """Render the viewer for a single timepoint or for a timelapse along specified axis."""
+    """Render the viewer for a single timepoint or for a timelapse along specified axis.
+
+    With several axes, each axis is stepped through in turn, leaving the
+    other axes where they are, and its frames form one row of the result.
+    """
     size = kwargs.pop("size", None)
     if size:
         warnings.warn(
@@ -24,6 +31,7 @@ def render_as_rgb(
             DeprecationWarning,
             stacklevel=2,
         )
+    _flush_overlays(viewer)
     if axis is not None:
         try:
             iter(axis)  # check if axis is iterable
@@ -31,46 +39,93 @@ def render_as_rgb(
             axis = [axis]
         if len(axis) == 1:
             axis = axis[0]
-            target_shape = viewer.export_figure(
-                scale_factor=upsample_factor, flash=False
-            ).shape
-            rgb = np.zeros(
-                (viewer.dims.range[axis][1].astype(int) + 1, *target_shape),
-                dtype=np.uint8,
-            )
-            for j in range(viewer.dims.range[axis][1].astype(int) + 1):
-                viewer.dims.set_current_step(axis, j)
-                rendered_img = viewer.export_figure(
-                    scale_factor=upsample_factor, flash=False
-                )
-                rgb[j] = rendered_img
+            n_frames = int(viewer.dims.range[axis][1]) + 1
+            frames = render_as_rgb_iter(viewer, axis, upsample_factor)
+            # the first frame also gives the shape of the stack, every frame
+            # is rendered into it so it needn't be zeroed
+            first = next(frames)
+            rgb = np.empty((n_frames, *first.shape), dtype=np.uint8)
+            rgb[0] = first
+            for j, frame in enumerate(frames, start=1):
+                rgb[j] = frame
         else:
-            target_shape = viewer.export_figure(
-                scale_factor=upsample_factor, flash=False
-            ).shape
+            set_current_step = viewer.dims.set_current_step
+            export_figure = viewer.export_figure
+            n_frames = [int(viewer.dims.range[ax][1]) + 1 for ax in axis]
+            set_current_step(axis[0], 0)
+            first = export_figure(scale_factor=upsample_factor, flash=False)
+            # the frames of axes shorter than the longest one are left black
             rgb = np.zeros(
-                (
-                    len(axis),
-                    viewer.dims.range[axis[0]][1].astype(int) + 1,
-                    *target_shape,
-                ),
-                dtype=np.uint8,
+                (len(axis), max(n_frames), *first.shape), dtype=np.uint8
             )
-            for ax in axis:
-                for j in range(viewer.dims.range[ax][1].astype(int) + 1):
-                    viewer.dims.set_current_step(ax, j)
-                    rendered_img = viewer.export_figure(
+            rgb[0, 0] = first
+            for row, (ax, n) in enumerate(zip(axis, n_frames)):
+                for j in range(1 if row == 0 else 0, n):
+                    set_current_step(ax, j)
+                    rgb[row, j] = export_figure(
                         scale_factor=upsample_factor, flash=False
                     )
-                    rgb[ax, j] = rendered_img
 
     else:
         rgb = viewer.export_figure(scale_factor=upsample_factor, flash=False)
     return rgb
 
 
+def render_as_rgb_iter(
+    viewer: napari.Viewer, axis: int, upsample_factor: int = 1
+) -> Iterator[np.ndarray]:
+    """Render the viewer frame by frame along the axis.
+
+    Unlike render_as_rgb, the frames are yielded as they are rendered, so
+    that e.g. save_image_stack can write them without keeping the whole
+    timelapse in memory.
+
+    Parameters
+    ----------
+    viewer : napari.Viewer
+        The viewer to render.
+    axis : int
+        The axis to step through.
+    upsample_factor : int, optional
+        Factor to upsample the rendered frames by, by default 1
+
+    Yields
+    ------
+    np.ndarray
+        The rendered RGBA frame of each step along the axis.
+    """
+    _flush_overlays(viewer)
+    n_frames = int(viewer.dims.range[axis][1]) + 1
+    _precompute_timestamps(viewer, axis, n_frames)
+    set_current_step = viewer.dims.set_current_step
+    export_figure = viewer.export_figure
+    for j in range(n_frames):
+        set_current_step(axis, j)
+        yield export_figure(scale_factor=upsample_factor, flash=False)
+
+
+def _flush_overlays(viewer: napari.Viewer):
+    """Apply the pending updates of the overlays before rendering."""
+    canvas = viewer.window._qt_viewer.canvas
+    for visuals in list(canvas._overlay_to_visual.values()):
+        if not isinstance(visuals, list):
+            visuals = [visuals]
+        for visual in visuals:
+            if getattr(visual, "_dirty", 0):
+                visual._flush()
+
+
+def _precompute_timestamps(viewer: napari.Viewer, axis: int, n_frames: int):
+    """Precompute the timestamps of the timestamp overlay on the axis."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        timestamp_overlay = viewer._overlays.get("timestamp")
+    if timestamp_overlay is not None and timestamp_overlay.time_axis == axis:
+        timestamp_overlay.precompute_timestamps(n_frames)
+
+
 def save_image_stack(
-    image,
+    image: np.ndarray | Iterable[np.ndarray],
     directory: Path | str = ".",
     name: str = "out",
     output_type: Literal["tif", "mp4", "gif", "png", "jpeg"] = "mp4",
@@ -80,8 +135,10 @@ def save_image_stack(
 
     Parameters
     ----------
-    image : np.ndarray
-        Image stack to save.
+    image : np.ndarray or iterable of np.ndarray
+        Image stack to save, or its frames, e.g. from render_as_rgb_iter.
+        Frames are written as they come in, except for tif files, which
+        are written as one stack.
     directory : Path | str, optional
         Directory to save the image stack, by default Path.cwd()
     name : str, optional
@@ -94,8 +151,23 @@ def save_image_stack(
     if isinstance(directory, str):
         directory = Path(directory)
     outpath = directory.joinpath(f"{name}.{output_type}").as_posix()
+    streamed = not isinstance(image, np.ndarray)
     if output_type == "tif":
-        io.imsave(outpath, image)
+        try:
+            import tifffile
+        except ImportError as e:
+            raise ImportError(
+                "You must install tifffile to export as tif, try `pip install tifffile`"
+            ) from e
+        stack = np.stack(list(image)) if streamed else image
+        # tifffile switches to BigTIFF by itself for stacks beyond 4 GB
+        tifffile.imwrite(
+            outpath,
+            stack,
+            compression="zlib",
+            predictor=True,
+            photometric="rgb" if stack.shape[-1] in (3, 4) else None,
+        )
     elif output_type == "mp4":
         try:
             import cv2
@@ -104,24 +176,40 @@ def save_image_stack(
                 "You must install opencv to export as mp4, try `pip install opencv-python`"
             ) from e
 
-        if image.ndim == 3:
+        if not streamed and image.ndim == 3:
             raise ValueError("Mp4 export only works for 3D+ data")
 
-        # Read the first image to get the width, height
-        frame = image[0]
-        h, w, _ = frame.shape
-
-        # Define the codec and create a VideoWriter object
-        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-        out = cv2.VideoWriter(outpath, fourcc, fps, (w, h))
-
-        for i in image:
-            out.write(
-                cv2.cvtColor(i, cv2.COLOR_RGBA2BGR)
-            )  # Write out frame to video
-
-        # Release everything when the job is finished
-        out.release()
+        out = None
+        # the encoder releases the GIL, so frames are written on a single
+        # thread, which keeps them in order, while the next ones render.
+        # At most two frames are queued so that streamed frames aren't all
+        # held in memory
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                pending = deque()
+                for frame in image:
+                    if out is None:
+                        # Read the first image to get the width, height
+                        h, w, _ = frame.shape
+                        # Define the codec and create a VideoWriter object
+                        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+                        out = cv2.VideoWriter(outpath, fourcc, fps, (w, h))
+                    # RGB(A) to BGR by reversing the channels in one copy
+                    pending.append(
+                        executor.submit(
+                            out.write, np.ascontiguousarray(frame[..., 2::-1])
+                        )
+                    )
+                    if len(pending) > 2:
+                        pending.popleft().result()
+                for future in pending:
+                    future.result()
+        finally:
+            # the executor has finished the queued writes by now, release
+            # the writer even if rendering or encoding failed, so that the
+            # file is finalized
+            if out is not None:
+                out.release()
         try:
             cv2.destroyAllWindows()
         except cv2.error:
@@ -134,9 +222,13 @@ def save_image_stack(
             raise ImportError(
                 "You must install imageio to export as gif, try `pip install imageio`"
             ) from e
-        if image.ndim == 3:
+        if not streamed and image.ndim == 3:
             raise ValueError("Gif export only works for 3D+ data")
-        imageio.mimsave(outpath, image, duration=1000 * 1 / fps)
+        with imageio.get_writer(
+            outpath, mode="I", duration=1000 * 1 / fps
+        ) as writer:
+            for frame in image:
+                writer.append_data(frame)
 
     elif output_type in ["png", "jpeg"]:
         try:
@@ -145,15 +237,29 @@ def save_image_stack(
             raise ImportError(
                 "You must install imageio to export as png or jpeg, try `pip install imageio`"
             ) from e
-        if image.ndim == 3:
+        if not streamed and image.ndim == 3:
             imageio.imwrite(outpath, image)
         else:
             # create a new directory
             directory = directory.joinpath(name)
             directory.mkdir(exist_ok=True)
 
-            for i, current_image in enumerate(image):
-                outpath = directory.joinpath(
-                    f"{name}_{i}.{output_type}"
-                ).as_posix()
-                imageio.imwrite(outpath, current_image)
+            # the encoders release the GIL, so the frames are encoded in
+            # parallel, with at most two frames per thread queued so that
+            # streamed frames aren't all held in memory
+            max_workers = os.cpu_count() or 1
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending = deque()
+                for i, current_image in enumerate(image):
+                    outpath = directory.joinpath(
+                        f"{name}_{i}.{output_type}"
+                    ).as_posix()
+                    pending.append(
+                        executor.submit(
+                            imageio.imwrite, outpath, current_image
+                        )
+                    )
+                    if len(pending) > 2 * max_workers:
+                        pending.popleft().result()
+                for future in pending:
+                    future.result()
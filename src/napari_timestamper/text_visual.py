@@ -478,6 +478,39 @@ class TextWithBoxVisual(Compound):
         self._outline_visual.visible = show
         self._corner_markers.visible = show
 
+    def update_layout(
+        self,
+        pos: Union[list[tuple], tuple] = (0, 0),
+        box_width: Union[list[float], float] = 0,
+    ):
+        # like update_data, but keeps the text, colors and font size
+        # bring arguments to correct shape
+        if isinstance(pos, tuple):
+            pos_x = [pos[0]]
+            pos_y = [pos[1]]
+        else:
+            pos_x = [p[0] for p in pos]
+            pos_y = [p[1] for p in pos]
+
+        if "bottom" in self.anchors:
+            self._textvisual.pos = tuple(
+                zip(
+                    pos_x,
+                    [p + 3 * self.rectangles_scale_factor for p in pos_y],
+                )
+            )
+        else:
+            self._textvisual.pos = pos
+        font_size = self._textvisual.font_size / self.font_scale_factor
+        height = [font_size * 1.75 * self.rectangles_scale_factor] * len(pos_y)
+
+        # keep the box colors, which are set through bgcolor
+        rects = self._rectagles_visual
+        rects.update_rects(
+            pos_x, pos_y, box_width, height, rects.color[: len(pos_x)]
+        )
+        self.update_outline()
+
     def update_data(
         self,
         text: Union[list[str], str],
@@ -4,16 +4,43 @@ import numpy as np
 def _find_grid_offsets(viewer):
     """
     Finds the offsets for the grid.
+
+    Returns an array of shape (n_layers, 2) with the (y, x) translation of
+    each layer, in the order of viewer.layers.
     """
-    layer_translations = []
-    extent = viewer._sliced_extent_world_augmented
     n_layers = len(viewer.layers)
-    for i, layer in enumerate(viewer.layers):
-        i_row, i_column = viewer.grid.position(n_layers - 1 - i, n_layers)
-        # viewer._subplot(layer, (i_row, i_column), extent)
-        scene_shift = extent[1] - extent[0]
-        translate_2d = np.multiply(scene_shift[-2:], (i_row, i_column))
-        translate = [0] * layer.ndim
-        translate[-2:] = translate_2d
-        layer_translations.append(translate)
-    return layer_translations
+    grid = viewer.grid
+    if not grid.enabled or n_layers < 2:
+        return np.zeros((n_layers, 2))
+
+    extent = viewer._sliced_extent_world_augmented
+    scene_shift = (extent[1] - extent[0])[-2:]
+    # vectorized version of grid.position(n_layers - 1 - i, n_layers)
+    n_row, n_column = grid.actual_shape(n_layers)
+    grid_index = np.arange(n_layers - 1, -1, -1)
+    if grid.stride < 0:
+        grid_index = n_layers - 1 - grid_index
+    grid_index = grid_index // abs(grid.stride) % (n_row * n_column)
+    i_rows, i_columns = np.divmod(grid_index, n_column)
+    return np.stack([i_rows, i_columns], axis=1) * scene_shift
+
+
+def _overlap_counts(y_offsets, x_offsets):
+    """
+    Returns for each (y, x) position the number of preceding positions that
+    are identical to it.
+    """
+    keys = np.stack([y_offsets, x_offsets], axis=1)
+    _, group = np.unique(keys, axis=0, return_inverse=True)
+    group = group.ravel()
+    order = np.argsort(group, kind="stable")
+    sorted_group = group[order]
+    group_starts = np.flatnonzero(
+        np.r_[True, sorted_group[1:] != sorted_group[:-1]]
+    )
+    group_sizes = np.diff(np.r_[group_starts, len(sorted_group)])
+    counts = np.empty(len(group), dtype=int)
+    counts[order] = np.arange(len(group)) - np.repeat(
+        group_starts, group_sizes
+    )
+    return counts